@@ -0,0 +1,361 @@
+"""Concurrent-session load test for the Streamlit app, fully offline.
+
+Each simulated student drives its own ``AppTest`` session through a full
+flow: upload -> concepts -> explain -> audio -> export -> chat. Sessions run
+on threads of one process, like sessions on one Streamlit server, so they
+share its caches, job queue and CPU. Gemini and gTTS are the stand-ins from
+``benchmarks/fakes.py``.
+
+Every session count runs in a fresh interpreter (cold caches, clean memory)
+and reports:
+
+- throughput: completed flows and script reruns per second
+- rerun latency percentiles, overall and per step
+- CPU seconds and RSS growth per session
+
+The JSON report records the revision and settings, so reports from different
+releases can be compared (``--baseline``). Capacity is the largest session
+count whose p95 rerun latency stays within ``--slo`` without failed flows.
+
+    python benchmarks/bench_load.py --sessions 1,4,8,16
+    python benchmarks/bench_load.py --sessions 8 --report load-report.json --baseline old-report.json
+"""
+
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from benchmarks.bench_pipeline import make_pdf, percentile  # noqa: E402
+
+STEPS = ["load", "upload", "explain", "audio", "export", "chat"]
+QUESTIONS = ["What is the main formula here?", "Can you give an example?", "What are common mistakes?"]
+
+
+def rss_mib():
+    """Current resident set size (Linux), else the peak."""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") / (1024 * 1024)
+    except (OSError, ValueError, AttributeError):
+        if resource is None:
+            return 0.0
+        scale = 1024 * 1024 if sys.platform == "darwin" else 1024
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / scale
+
+
+def cpu_seconds():
+    if resource is None:
+        return time.process_time()
+    usage = resource.getrusage(resource.RUSAGE_SELF)
+    return usage.ru_utime + usage.ru_stime
+
+
+def share_test_runtime():
+    """Let AppTest sessions run concurrently in one process.
+
+    ``AppTest.run`` installs a mock ``Runtime`` and patches the
+    ``global.appTest`` option for the duration of each run, then undoes both,
+    pulling them out from under runs on other threads. Set the option for the
+    whole process and route the runtime assignments through a subclass that
+    keeps the first mock installed.
+    """
+    from streamlit import config
+    from streamlit.runtime import Runtime
+    from streamlit.testing.v1 import app_test
+
+    config.set_option("global.appTest", True)
+
+    class KeepFirstInstance(type(Runtime)):
+        def __setattr__(cls, name, value):
+            if name != "_instance":
+                super().__setattr__(name, value)
+            elif value is not None and Runtime._instance is None:
+                Runtime._instance = value
+
+    app_test.Runtime = KeepFirstInstance("Runtime", (Runtime,), {})
+
+
+# === SIMULATED SESSION ===
+class Session:
+    """One student's flow; records the latency of every script run."""
+
+    def __init__(self, index, document, args):
+        from streamlit.testing.v1 import AppTest
+
+        self.index = index
+        self.document = document
+        self.args = args
+        self.at = AppTest.from_file(os.path.join(ROOT, "app.py"), default_timeout=args.timeout)
+        self.reruns = []
+        self.error = None
+
+    def run(self, step):
+        started = time.perf_counter()
+        self.at.run()
+        self.reruns.append((step, time.perf_counter() - started))
+        if self.at.exception:
+            raise RuntimeError(f"{step}: {self.at.exception[0].message}")
+
+    def think(self):
+        time.sleep(self.args.think)
+
+    def poll(self, step, done):
+        """Rerun like the app's job fragment does until ``done()`` or the timeout."""
+        deadline = time.monotonic() + self.args.timeout
+        while not done():
+            if time.monotonic() > deadline:
+                raise TimeoutError(f"{step} did not finish in {self.args.timeout}s")
+            time.sleep(self.args.poll)
+            self.run(step)
+
+    def flow(self):
+        name, data = self.document
+        state = self.at.session_state
+        self.run("load")
+        self.think()
+        self.at.file_uploader[0].set_value((name, data, "application/pdf"))
+        self.run("upload")
+        concepts = state["concepts"]
+        if not concepts:
+            raise RuntimeError("upload: no concepts found")
+        topic = concepts[self.index % len(concepts)]
+        self.think()
+
+        self.at.selectbox(key="topic_select").set_value(topic)
+        self.at.button(key="explain_btn").click()
+        self.run("explain")
+        self.poll("explain", lambda: topic in state["explanations"])
+        self.think()
+
+        self.at.button(key="audio_btn").click()
+        self.run("audio")
+        self.poll("audio", lambda: topic in state["audio_files"])
+        self.think()
+
+        self.at.button(key="export_btn").click()
+        self.run("export")
+        self.think()
+
+        for question in QUESTIONS[:self.args.questions]:
+            self.at.chat_input[0].set_value(question)
+            self.run("chat")
+            self.think()
+
+    def __call__(self):
+        try:
+            self.flow()
+        except Exception as e:
+            self.error = f"{type(e).__name__}: {e}"
+
+
+def run_level(args):
+    """Child process: run ``args.child`` concurrent sessions and print one JSON line."""
+    os.environ["SMARTCONCEPT_CACHE_DIR"] = tempfile.mkdtemp(prefix="smartconcept-load-")
+    os.environ["SMARTCONCEPT_ARTIFACT_DIR"] = tempfile.mkdtemp(prefix="smartconcept-load-artifacts-")
+    os.environ.setdefault("SMARTCONCEPT_GEMINI_RPM", "1000000")
+    os.environ.setdefault("SMARTCONCEPT_GEMINI_TPM", "1000000000")
+
+    import warnings
+
+    warnings.simplefilter("ignore")
+    import logging
+
+    logging.getLogger("streamlit").setLevel(logging.ERROR)
+
+    from benchmarks.fakes import FakeGeminiModel, FakeTTS
+    from smartconcept import resources, tracing, tts
+
+    share_test_runtime()
+    resources.set_gemini_model(FakeGeminiModel(latency=args.gemini_latency, jitter=args.gemini_jitter, seed=args.seed))
+    FakeTTS.configure(latency=args.tts_latency, jitter=args.tts_jitter, seed=args.seed)
+    tts.gTTS = FakeTTS
+
+    # Distinct page counts give distinct documents (and fingerprints)
+    documents = [(f"lecture-{i + 1}.pdf", make_pdf(args.pages + i)) for i in range(args.documents)]
+    sessions = [Session(i, documents[i % len(documents)], args) for i in range(args.child)]
+
+    # Warm up imports with one throwaway run so they are not charged to the sessions
+    Session(0, documents[0], args).run("warmup")
+    tracing.registry.reset()
+    baseline_rss, baseline_cpu = rss_mib(), cpu_seconds()
+    peak_rss = [baseline_rss]
+
+    def sample_rss():
+        while not stop.wait(0.2):
+            peak_rss[0] = max(peak_rss[0], rss_mib())
+
+    stop = threading.Event()
+    sampler = threading.Thread(target=sample_rss, daemon=True)
+    sampler.start()
+    started = time.perf_counter()
+    threads = []
+    for session in sessions:
+        thread = threading.Thread(target=session, name=f"session-{session.index}")
+        thread.start()
+        threads.append(thread)
+        # Students do not all arrive in the same millisecond
+        time.sleep(args.ramp / max(len(sessions), 1))
+    for thread in threads:
+        thread.join()
+    wall = time.perf_counter() - started
+    stop.set()
+    cpu = cpu_seconds() - baseline_cpu
+    peak_rss[0] = max(peak_rss[0], rss_mib())
+
+    reruns = [seconds for session in sessions for _, seconds in session.reruns]
+    steps = {}
+    for step in STEPS:
+        samples = [seconds for session in sessions for name, seconds in session.reruns if name == step]
+        steps[step] = {
+            "reruns": len(samples),
+            "p50_s": percentile(samples, 50),
+            "p95_s": percentile(samples, 95),
+            "max_s": max(samples, default=0.0),
+        }
+    completed = [session for session in sessions if session.error is None]
+    print(json.dumps({
+        "sessions": args.child,
+        "completed": len(completed),
+        "errors": [session.error for session in sessions if session.error],
+        "wall_s": wall,
+        "flows_per_min": len(completed) / wall * 60 if wall else 0.0,
+        "reruns_per_s": len(reruns) / wall if wall else 0.0,
+        "rerun_p50_s": percentile(reruns, 50),
+        "rerun_p95_s": percentile(reruns, 95),
+        "rerun_p99_s": percentile(reruns, 99),
+        "steps": steps,
+        "cpu_s": cpu,
+        "cpu_s_per_session": cpu / args.child,
+        "cpu_utilization": cpu / wall if wall else 0.0,
+        "rss_baseline_mib": baseline_rss,
+        "rss_peak_mib": peak_rss[0],
+        "rss_mib_per_session": (peak_rss[0] - baseline_rss) / args.child,
+        "spans": {
+            name: {"count": span["count"], "p95_s": span["p95_s"], "sum_s": span["sum_s"]}
+            for name, span in tracing.snapshot()["spans"].items()
+        },
+    }))
+
+
+# === DRIVER ===
+def revision():
+    try:
+        out = subprocess.run(["git", "describe", "--always", "--dirty"], cwd=ROOT, capture_output=True, text=True)
+        return out.stdout.strip() or None
+    except OSError:
+        return None
+
+
+def child_args(args, sessions):
+    options = [
+        "--child", str(sessions), "--documents", str(args.documents), "--pages", str(args.pages),
+        "--questions", str(args.questions), "--think", str(args.think), "--poll", str(args.poll),
+        "--ramp", str(args.ramp), "--timeout", str(args.timeout), "--seed", str(args.seed),
+        "--gemini-latency", str(args.gemini_latency), "--gemini-jitter", str(args.gemini_jitter),
+        "--tts-latency", str(args.tts_latency), "--tts-jitter", str(args.tts_jitter),
+    ]
+    return [sys.executable, os.path.abspath(__file__)] + options
+
+
+def report_line(level, baseline=None):
+    line = (
+        f"{level['sessions']:>8}{level['completed']:>6}{level['flows_per_min']:>11.1f}"
+        f"{level['rerun_p50_s']:>9.3f}{level['rerun_p95_s']:>9.3f}{level['rerun_p99_s']:>9.3f}"
+        f"{level['cpu_s_per_session']:>11.2f}{level['cpu_utilization']:>7.2f}{level['rss_mib_per_session']:>10.1f}"
+    )
+    if baseline:
+        change = (level["rerun_p95_s"] / baseline["rerun_p95_s"] - 1) * 100 if baseline["rerun_p95_s"] else 0.0
+        line += f"   p95 {change:+.0f}% vs baseline"
+    return line
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--sessions", default="1,4,8", help="comma-separated concurrent session counts")
+    parser.add_argument("--documents", type=int, default=2, help="distinct lecture files the sessions share")
+    parser.add_argument("--pages", type=int, default=12, help="pages per synthetic lecture")
+    parser.add_argument("--questions", type=int, default=2, help="chat questions per session")
+    parser.add_argument("--think", type=float, default=0.5, help="seconds between user actions")
+    parser.add_argument("--poll", type=float, default=1.0, help="seconds between job polls")
+    parser.add_argument("--ramp", type=float, default=2.0, help="seconds over which sessions arrive")
+    parser.add_argument("--timeout", type=float, default=300, help="per-run and per-job timeout (seconds)")
+    parser.add_argument("--slo", type=float, default=1.0, help="p95 rerun latency target for capacity (seconds)")
+    parser.add_argument("--gemini-latency", type=float, default=0.5)
+    parser.add_argument("--gemini-jitter", type=float, default=0.1)
+    parser.add_argument("--tts-latency", type=float, default=0.3, help="seconds per 1000 characters")
+    parser.add_argument("--tts-jitter", type=float, default=0.05)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--report", help="write the capacity report (JSON) to this file")
+    parser.add_argument("--baseline", help="earlier report to compare against")
+    parser.add_argument("--child", type=int, help=argparse.SUPPRESS)
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    if args.child:
+        run_level(args)
+        return 0
+
+    import streamlit
+
+    baseline = {}
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as f:
+            baseline = {level["sessions"]: level for level in json.load(f)["levels"]}
+
+    levels = []
+    print(f"{'sessions':>8}{'done':>6}{'flows/min':>11}{'p50 s':>9}{'p95 s':>9}{'p99 s':>9}"
+          f"{'CPU s/ses':>11}{'cores':>7}{'MiB/ses':>10}")
+    for sessions in [int(n) for n in args.sessions.split(",")]:
+        out = subprocess.run(child_args(args, sessions), cwd=ROOT, capture_output=True, text=True)
+        if out.returncode != 0:
+            sys.stderr.write(out.stderr)
+            return out.returncode
+        level = json.loads(out.stdout.strip().splitlines()[-1])
+        levels.append(level)
+        print(report_line(level, baseline.get(sessions)))
+        for error in level["errors"]:
+            print(f"{'':>8}  {error}")
+
+    within = [
+        level["sessions"] for level in levels
+        if level["rerun_p95_s"] <= args.slo and level["completed"] == level["sessions"]
+    ]
+    capacity = max(within, default=0)
+    print(f"capacity: {capacity} concurrent session(s) with p95 rerun <= {args.slo}s"
+          + (" (largest level tested)" if within and capacity == levels[-1]["sessions"] else ""))
+
+    if args.report:
+        settings = {key: value for key, value in vars(args).items() if key not in ("report", "baseline", "child")}
+        report = {
+            "generated": time.time(),
+            "revision": revision(),
+            "python": platform.python_version(),
+            "streamlit": streamlit.__version__,
+            "cpu_count": os.cpu_count(),
+            "settings": settings,
+            "capacity": {"slo_p95_s": args.slo, "max_sessions": capacity},
+            "levels": levels,
+        }
+        with open(args.report, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,73 @@
+"""Micro-benchmark for the TTS text normalizer.
+
+Times the compiled single-pass normalizer on explanations of growing size and
+compares it with the previous one-``str.replace``-per-rule implementation.
+Per-character cost should stay flat as the input grows. Expect the two to be
+roughly on par: each ``str.replace`` pass runs in C, while the single pass
+pays a Python callback per match. tests/test_normalize.py checks that both
+give the same output.
+
+    python benchmarks/bench_normalize.py
+"""
+
+import os
+import re
+import sys
+import timeit
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from smartconcept.normalize import normalize  # noqa: E402
+
+# A typical Telugu + English explanation section as returned by Gemini
+PROSE = (
+    "## 1. **Definition**\n"
+    "Mean ante data lo unna anni values ni add chesi, total count tho divide cheyadam. "
+    "Idi మనకు data యొక్క central value ని చూపిస్తుంది. Students tarachuga average ani kuda antaru.\n"
+    "- **Formula**: Mean = Sum of values / Number of values (e.g. 10, 20, 30 అంటే 60/3 = 20)\n"
+)
+# Symbol-heavy maths text: nearly every other token hits a rule
+SYMBOLS = (
+    "Mean అంటే Average (e.g. 5+3=8). ఉదా. Dr. Rao explains x-y! in Fig. 2, i.e. 10% at 25°C.\n"
+    "- Key point: Σ over A ∩ B, A ∪ B, n÷2, 2^3 [see Eq. 4 / Ch. 3] {No. 7}\t_note_ •\n"
+)
+SIZES = [1_000, 10_000, 50_000, 100_000, 200_000]
+
+
+def legacy_telugu(text):
+    """The pre-compilation implementation: one full pass per table entry."""
+    replacements = {
+        "ఉదా.": "ఉదాహరణకు", "అంటే": "అంటే ", "అనగా": "అనగా ", "-": " మైనస్ ",
+        "(": ", ", ")": ", ", "[": ", ", "]": ", ", "{": ", ", "}": ", ",
+        "!": "ఫ్యాక్టోరియల్", "•": "", "x": "ఇన్టూ", "=": " ఈక్వల్టూ ", "+": " ప్లస్ ",
+        "/": " డివైడెడ్బై ", "∩": "ఇంటర్సెక్షన్", "∪": "యూనియన్", "÷": "డివైడెడ్బై",
+        "Σ": "సమ్మషన్", "^": " పవర్ ", "%": " పర్సెంట్ ", "°C": " డిగ్రీల సెల్సియస్ ",
+        "Dr.": "డాక్టర్ ", "Mr.": "మిస్టర్ ", "No.": "నంబర్ ", "e.g.": "ఉదాహరణకు ",
+        "i.e.": "అంటే ", "Fig.": "ఫిగర్ ", "Eq.": "సమీకరణం ", "Ch.": "అధ్యాయం ",
+        "*": "", "#": "", "_": "", "\n": ". ", "\t": " ",
+    }
+    for k, v in replacements.items():
+        text = text.replace(k, v)
+    text = re.sub(r"(\d+)\.", r"\n\n\1.", text)
+    text = re.sub(r" +", " ", text)
+    return text.strip()
+
+
+def best_of(func, text, repeat=5):
+    return min(timeit.repeat(lambda: func(text), number=1, repeat=repeat))
+
+
+def main():
+    for label, sample in (("prose", PROSE), ("symbol-heavy", SYMBOLS)):
+        print(f"\n{label}")
+        print(f"{'chars':>8} {'compiled ms':>12} {'ns/char':>8} {'legacy ms':>10} {'speedup':>8}")
+        for size in SIZES:
+            text = (sample * (size // len(sample) + 1))[:size]
+            compiled = best_of(lambda t: normalize(t, "tts-te"), text)
+            legacy = best_of(legacy_telugu, text)
+            print(f"{size:>8} {compiled * 1e3:>12.2f} {compiled / size * 1e9:>8.0f} "
+                  f"{legacy * 1e3:>10.2f} {legacy / compiled:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,265 @@
+"""End-to-end pipeline benchmark that runs fully offline.
+
+Gemini and gTTS are replaced by the local stand-ins in ``benchmarks/fakes.py``
+and a corpus of synthetic PDFs/PPTX of increasing size is pushed through the
+same stages the app runs: extraction, concept identification, explanation,
+audio and PDF export. For every stage it reports latency percentiles,
+throughput and peak memory.
+
+    python benchmarks/bench_pipeline.py
+    python benchmarks/bench_pipeline.py --sizes 10,50,200 --repeat 5 --json out.json
+    python benchmarks/bench_pipeline.py --gemini-latency 0 --tts-latency 0   # CPU cost only
+    python benchmarks/bench_pipeline.py --tts-backend espeak   # real local speech engine
+
+Caches live in a temporary directory and are cleared between runs, so every
+run is cold unless ``--warm`` is given.
+"""
+
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+STAGES = ["extraction", "concepts", "explanation", "audio", "export"]
+
+TOPICS = [
+    "Mean and Median", "Standard Deviation", "Probability Rules", "Permutations",
+    "Combinations", "Binomial Distribution", "Normal Distribution", "Sampling",
+    "Hypothesis Testing", "Correlation", "Linear Regression", "Time Series",
+]
+PARAGRAPH = (
+    "This section introduces {topic} with a worked example. Students first learn the "
+    "definition, then the formula, and finally apply it to a small data set of marks. "
+    "Common mistakes include mixing up the order of operations and forgetting units. "
+)
+
+
+def topic_for(index):
+    return f"Section {index + 1}: {TOPICS[index % len(TOPICS)]}"
+
+
+def make_pdf(pages):
+    """Synthetic lecture notes: one large-font heading per page plus body text."""
+    import fitz  # PyMuPDF
+
+    with fitz.open() as doc:
+        for index in range(pages):
+            page = doc.new_page()
+            page.insert_text((72, 80), topic_for(index), fontsize=20)
+            body = PARAGRAPH.format(topic=TOPICS[index % len(TOPICS)]) * 4
+            page.insert_textbox(fitz.Rect(72, 110, 520, 770), body, fontsize=10)
+        return doc.tobytes()
+
+
+def make_pptx(slides):
+    """Synthetic slide deck: a title and a bullet body per slide."""
+    import io
+
+    from pptx import Presentation
+
+    prs = Presentation()
+    layout = prs.slide_layouts[1]
+    for index in range(slides):
+        slide = prs.slides.add_slide(layout)
+        slide.shapes.title.text = topic_for(index)
+        slide.placeholders[1].text = PARAGRAPH.format(topic=TOPICS[index % len(TOPICS)])
+    output = io.BytesIO()
+    prs.save(output)
+    return output.getvalue()
+
+
+def percentile(samples, pct):
+    ordered = sorted(samples)
+    if not ordered:
+        return 0.0
+    rank = (len(ordered) - 1) * pct / 100
+    low = int(rank)
+    high = min(low + 1, len(ordered) - 1)
+    return ordered[low] + (ordered[high] - ordered[low]) * (rank - low)
+
+
+def max_rss_mb():
+    if resource is None:
+        return None
+    scale = 1024 * 1024 if sys.platform == "darwin" else 1024
+    own = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    children = resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss
+    return round(own / scale, 1), round(children / scale, 1)
+
+
+class StageTimer:
+    """Collects wall time, item counts and tracemalloc peaks per stage."""
+
+    def __init__(self):
+        self.samples = {stage: [] for stage in STAGES}
+        self.items = {stage: 0 for stage in STAGES}
+        self.peaks = {stage: 0 for stage in STAGES}
+
+    def run(self, stage, func, count_items):
+        tracemalloc.reset_peak()
+        started = time.perf_counter()
+        result = func()
+        elapsed = time.perf_counter() - started
+        self.peaks[stage] = max(self.peaks[stage], tracemalloc.get_traced_memory()[1])
+        self.samples[stage].append(elapsed)
+        self.items[stage] += count_items(result)
+        return result
+
+    def report(self):
+        rows = {}
+        for stage in STAGES:
+            samples = self.samples[stage]
+            total = sum(samples)
+            rows[stage] = {
+                "runs": len(samples),
+                "p50_s": percentile(samples, 50),
+                "p95_s": percentile(samples, 95),
+                "p99_s": percentile(samples, 99),
+                "items": self.items[stage],
+                "items_per_s": self.items[stage] / total if total else 0.0,
+                "peak_mib": self.peaks[stage] / (1024 * 1024),
+            }
+        return rows
+
+
+def clear_caches(resources, export):
+    for get_cache in (resources.get_llm_cache, resources.get_extraction_cache, resources.get_tts_cache):
+        get_cache().clear()
+    export.build_explanations_pdf.cache_clear()
+
+
+def run_document(timer, name, data, args, modules):
+    audio, documents, export, llm, BM25Index, split_passages, run_batch = modules
+
+    pages, _structure = timer.run(
+        "extraction", lambda: documents.load_document(data, name), lambda result: len(result[0])
+    )
+    # Always exercise the Gemini path, even when the document has an outline
+    concepts = timer.run(
+        "concepts", lambda: llm.identify_concepts("\n".join(pages)), len
+    )[:args.max_concepts]
+
+    index = BM25Index(split_passages(pages))
+    explained = timer.run(
+        "explanation",
+        lambda: llm.explain_all_concepts(
+            concepts,
+            lambda concept: index.context_for(concept, budget_chars=6000),
+            args.lang,
+            max_workers=args.workers,
+            batch_size=args.batch_size,
+        ),
+        len,
+    )
+    explanations = [(concept, result[0]) for concept, result, error in explained if error is None]
+
+    timer.run(
+        "audio",
+        lambda: run_batch(
+            [text for _, text in explanations],
+            lambda text: audio.generate_high_quality_audio(
+                text, args.lang, profile=args.audio_profile, tempo=args.tempo
+            ),
+            max_workers=args.workers,
+        ),
+        len,
+    )
+    timer.run("export", lambda: export.build_explanations_pdf(tuple(explanations)), lambda _: len(explanations))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--sizes", default="5,20,50", help="pages/slides per synthetic document")
+    parser.add_argument("--formats", default="pdf,pptx")
+    parser.add_argument("--repeat", type=int, default=3, help="runs per document")
+    parser.add_argument("--max-concepts", type=int, default=6, help="concepts explained per document")
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--batch-size", type=int, default=1, help="concepts per explanation request")
+    parser.add_argument("--lang", default="English", choices=["English", "Telugu"])
+    parser.add_argument("--warm", action="store_true", help="keep caches between runs")
+    parser.add_argument("--gemini-latency", type=float, default=0.5)
+    parser.add_argument("--gemini-jitter", type=float, default=0.1)
+    parser.add_argument("--gemini-failure-rate", type=float, default=0.0)
+    parser.add_argument("--tts-latency", type=float, default=0.3, help="seconds per 1000 characters")
+    parser.add_argument("--tts-jitter", type=float, default=0.05)
+    parser.add_argument("--tts-failure-rate", type=float, default=0.0)
+    parser.add_argument("--tts-backend", choices=["gtts", "espeak", "piper"], default="gtts",
+                        help="gtts uses the stand-in; espeak/piper run the local engine")
+    parser.add_argument("--audio-profile", choices=["opus", "mp3"], help="default: SMARTCONCEPT_AUDIO_PROFILE")
+    parser.add_argument("--tempo", type=float, help="default: SMARTCONCEPT_AUDIO_TEMPO")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--json", help="also write the results to this file")
+    args = parser.parse_args()
+
+    # Settings are read at import time, so configure the environment first
+    cache_dir = tempfile.mkdtemp(prefix="smartconcept-bench-")
+    os.environ["SMARTCONCEPT_CACHE_DIR"] = cache_dir
+    os.environ.setdefault("SMARTCONCEPT_GEMINI_RPM", "1000000")
+    os.environ.setdefault("SMARTCONCEPT_GEMINI_TPM", "1000000000")
+    os.environ["SMARTCONCEPT_TTS_BACKEND"] = args.tts_backend
+
+    from benchmarks.fakes import FakeGeminiModel, FakeTTS
+    from smartconcept import audio, documents, export, llm, resources, tracing, tts
+    from smartconcept.batch import run_batch
+    from smartconcept.retrieval import BM25Index, split_passages
+
+    resources.set_gemini_model(FakeGeminiModel(
+        latency=args.gemini_latency, jitter=args.gemini_jitter,
+        failure_rate=args.gemini_failure_rate, seed=args.seed,
+    ))
+    FakeTTS.configure(
+        latency=args.tts_latency, jitter=args.tts_jitter,
+        failure_rate=args.tts_failure_rate, seed=args.seed,
+    )
+    tts.gTTS = FakeTTS
+    modules = (audio, documents, export, llm, BM25Index, split_passages, run_batch)
+
+    builders = {"pdf": make_pdf, "pptx": make_pptx}
+    sizes = [int(size) for size in args.sizes.split(",")]
+    results = {"settings": vars(args), "documents": {}}
+
+    tracemalloc.start()
+    print(f"{'document':<20}{'stage':<13}{'p50 s':>9}{'p95 s':>9}{'p99 s':>9}{'items/s':>10}{'peak MiB':>10}")
+    for fmt in args.formats.split(","):
+        for size in sizes:
+            name = f"synthetic-{size}.{fmt}"
+            data = builders[fmt](size)
+            timer = StageTimer()
+            for _ in range(args.repeat):
+                if not args.warm:
+                    clear_caches(resources, export)
+                run_document(timer, name, data, args, modules)
+            report = timer.report()
+            results["documents"][name] = report
+            for stage, row in report.items():
+                print(
+                    f"{name:<20}{stage:<13}{row['p50_s']:>9.3f}{row['p95_s']:>9.3f}{row['p99_s']:>9.3f}"
+                    f"{row['items_per_s']:>10.1f}{row['peak_mib']:>10.1f}"
+                )
+    tracemalloc.stop()
+
+    rss = max_rss_mb()
+    if rss:
+        print(f"max RSS: {rss[0]} MiB (main), {rss[1]} MiB (extraction workers)")
+        results["max_rss_mib"] = {"main": rss[0], "children": rss[1]}
+    results["spans"] = tracing.snapshot()["spans"]
+    results["fake_calls"] = {"gemini": resources.get_gemini_model().calls, "tts": FakeTTS.calls}
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,115 @@
+"""Startup and rerun benchmark for the Streamlit app.
+
+Each sample runs in a fresh interpreter so imports are really cold:
+
+- ``import``: importing everything the app imports, before any script code
+- ``first run``: the first full script run under Streamlit's AppTest (cold start)
+- ``rerun``: later runs of the same session, i.e. the cost of every interaction
+
+Gemini is never called: the script only renders the upload screen.
+
+    python benchmarks/bench_startup.py
+    python benchmarks/bench_startup.py --compare HEAD~1   # also measure another revision
+"""
+
+import argparse
+import json
+import os
+import shutil
+import statistics
+import subprocess
+import sys
+import tarfile
+import tempfile
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Runs inside the child interpreter; prints one JSON line
+CHILD = r"""
+import json, sys, time, warnings
+warnings.simplefilter("ignore")
+started = time.perf_counter()
+from streamlit.testing.v1 import AppTest
+streamlit_ready = time.perf_counter()
+at = AppTest.from_file("app.py", default_timeout=120)
+first = time.perf_counter()
+at.run()
+first = time.perf_counter() - first
+assert not at.exception, at.exception
+reruns = []
+for _ in range(int(sys.argv[1])):
+    t = time.perf_counter()
+    at.run()
+    reruns.append(time.perf_counter() - t)
+modules = sorted(sys.modules)
+print(json.dumps({
+    "streamlit_import": streamlit_ready - started,
+    "first_run": first,
+    "reruns": reruns,
+    "heavy_modules": [m for m in ("fitz", "pptx", "pydub", "gtts", "fpdf", "google.generativeai") if m in modules],
+}))
+"""
+
+
+def measure(tree, samples, reruns):
+    env = dict(os.environ, SMARTCONCEPT_CACHE_DIR=tempfile.mkdtemp(prefix="smartconcept-startup-"))
+    runs = []
+    for _ in range(samples):
+        out = subprocess.run(
+            [sys.executable, "-c", CHILD, str(reruns)],
+            cwd=tree, env=env, capture_output=True, text=True, check=True,
+        )
+        runs.append(json.loads(out.stdout.strip().splitlines()[-1]))
+    shutil.rmtree(env["SMARTCONCEPT_CACHE_DIR"], ignore_errors=True)
+    return {
+        "first_run_s": statistics.median(r["first_run"] for r in runs),
+        "rerun_s": statistics.median(t for r in runs for t in r["reruns"]),
+        "heavy_modules_after_first_run": runs[-1]["heavy_modules"],
+    }
+
+
+def checkout(ref):
+    """Extract ``ref`` of this repository into a temporary directory."""
+    target = tempfile.mkdtemp(prefix="smartconcept-ref-")
+    archive = subprocess.run(["git", "archive", ref], cwd=ROOT, capture_output=True, check=True).stdout
+    with tempfile.TemporaryFile() as f:
+        f.write(archive)
+        f.seek(0)
+        with tarfile.open(fileobj=f) as tar:
+            tar.extractall(target)
+    return target
+
+
+def report(label, result):
+    print(
+        f"{label:<12}first run {result['first_run_s'] * 1000:8.1f} ms   "
+        f"rerun {result['rerun_s'] * 1000:7.1f} ms   "
+        f"heavy modules loaded: {', '.join(result['heavy_modules_after_first_run']) or 'none'}"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--samples", type=int, default=5, help="fresh interpreters per tree")
+    parser.add_argument("--reruns", type=int, default=10, help="reruns measured per interpreter")
+    parser.add_argument("--compare", metavar="REF", help="git revision to measure as a baseline")
+    parser.add_argument("--json", help="also write the results to this file")
+    args = parser.parse_args()
+
+    results = {"current": measure(ROOT, args.samples, args.reruns)}
+    report("current", results["current"])
+    if args.compare:
+        tree = checkout(args.compare)
+        try:
+            results[args.compare] = measure(tree, args.samples, args.reruns)
+        finally:
+            shutil.rmtree(tree, ignore_errors=True)
+        report(args.compare, results[args.compare])
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,147 @@
+"""Local stand-ins for Gemini and gTTS used by the offline benchmarks.
+
+Both mimic the latency and output shape of the real services closely enough
+to exercise the pipeline (caching, concurrency, MP3 joining) without network
+access or API quota. Latency, jitter and failure rate are configurable and
+seeded so runs are repeatable.
+"""
+
+import json
+import os
+import random
+import re
+import sys
+import threading
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from smartconcept.mp3 import parse_header, silent_frames  # noqa: E402
+
+# MPEG-2 Layer III, 32 kbps, 24 kHz, mono: what gTTS returns
+GTTS_FRAME_HEADER = parse_header(b"\xff\xf3\x44\xc4", 0)
+# Roughly how fast gTTS voices read, used to size the fake audio
+CHARS_PER_SECOND = 15
+
+
+class FakeServiceError(RuntimeError):
+    pass
+
+
+class _Latency:
+    """Seeded latency/failure model shared by the fakes."""
+
+    def __init__(self, latency, jitter, failure_rate, seed):
+        self.latency = latency
+        self.jitter = jitter
+        self.failure_rate = failure_rate
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+
+    def wait(self, scale=1.0):
+        with self._lock:
+            delay = self.latency * scale + self._random.uniform(0, self.jitter)
+            failed = self._random.random() < self.failure_rate
+        time.sleep(delay)
+        if failed:
+            raise FakeServiceError("simulated transient failure")
+
+
+class _Response:
+    def __init__(self, text):
+        self.text = text
+
+
+class FakeGeminiModel:
+    """Drop-in for ``genai.GenerativeModel`` with canned, prompt-shaped answers.
+
+    Concept prompts get a numbered list built from the heading-like lines of
+    the prompt, batched explanation prompts a JSON object with one explanation
+    per listed topic; anything else gets an explanation of ``explanation_chars``.
+    Streaming yields the answer in ``chunk_chars`` pieces, spreading the
+    latency so time-to-first-token is meaningful.
+    """
+
+    def __init__(self, latency=0.5, jitter=0.1, failure_rate=0.0, seed=0,
+                 explanation_chars=4000, chunk_chars=200):
+        self._latency = _Latency(latency, jitter, failure_rate, seed)
+        self.explanation_chars = explanation_chars
+        self.chunk_chars = chunk_chars
+        self.calls = 0
+
+    def _answer(self, prompt):
+        if "FORMAT STRICTLY" in prompt:
+            return self._concept_list(prompt)
+        if "OUTPUT FORMAT" in prompt:
+            topics = re.findall(r"^- (.+)$", prompt.split("Topics:", 1)[1].split("\n\n", 1)[0], re.M)
+            return json.dumps({topic: self._explanation(topic) for topic in topics}, ensure_ascii=False)
+        topic = re.search(r"topic '([^']*)'", prompt)
+        return self._explanation(topic.group(1) if topic else "the topic")
+
+    def _explanation(self, topic):
+        sentence = f"{topic} is explained here with a simple example and the key formula. "
+        repeats = self.explanation_chars // len(sentence) + 1
+        return f"## 1. Definition\n{(sentence * repeats)[:self.explanation_chars]}"
+
+    @staticmethod
+    def _concept_list(prompt):
+        body = prompt.split("FORMAT STRICTLY")[0]
+        numbered = re.findall(r"^\d+\. (.+)$", body, re.M)
+        if numbered:
+            # Consolidation prompt: hand the candidates back unchanged
+            topics = numbered
+        else:
+            topics = re.findall(r"^((?:Chapter|Section) \d+[^\n]{0,60})$", body, re.M)
+        seen = []
+        for topic in topics:
+            if topic not in seen:
+                seen.append(topic)
+        return "\n".join(f"{i}. {topic}" for i, topic in enumerate(seen, start=1))
+
+    def generate_content(self, prompt, stream=False):
+        self.calls += 1
+        if not stream:
+            self._latency.wait()
+            return _Response(self._answer(prompt))
+        return self._stream(prompt)
+
+    def _stream(self, prompt):
+        text = self._answer(prompt)
+        pieces = [text[i:i + self.chunk_chars] for i in range(0, len(text), self.chunk_chars)] or [""]
+        # First chunk carries a third of the latency, the rest is spread out
+        self._latency.wait(scale=1 / 3)
+        for index, piece in enumerate(pieces):
+            if index:
+                time.sleep(self._latency.latency * 2 / 3 / max(len(pieces) - 1, 1))
+            yield _Response(piece)
+
+
+class FakeTTS:
+    """Drop-in for ``gtts.gTTS`` that writes silent MP3 of a plausible length.
+
+    Configure the class (not instances) before patching it in, since the
+    pipeline constructs a new object per chunk::
+
+        FakeTTS.configure(latency=0.3)
+        tts.gTTS = FakeTTS
+    """
+
+    _model = _Latency(0.3, 0.1, 0.0, 0)
+    calls = 0
+
+    @classmethod
+    def configure(cls, latency=0.3, jitter=0.1, failure_rate=0.0, seed=0):
+        cls._model = _Latency(latency, jitter, failure_rate, seed)
+        cls.calls = 0
+
+    def __init__(self, text, lang="en", slow=False, lang_check=True, **kwargs):
+        self.text = text
+        self.lang = lang
+        self.slow = slow
+
+    def write_to_fp(self, fp):
+        type(self).calls += 1
+        # gTTS latency grows with the amount of text it has to fetch
+        self._model.wait(scale=max(len(self.text), 1) / 1000)
+        duration_ms = len(self.text) * 1000 / CHARS_PER_SECOND * (1.5 if self.slow else 1)
+        fp.write(silent_frames(GTTS_FRAME_HEADER, duration_ms))
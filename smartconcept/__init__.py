@@ -0,0 +1 @@
+"""Reusable building blocks for the SmartConcept Explainer app."""
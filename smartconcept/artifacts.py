@@ -0,0 +1,177 @@
+# === ARTIFACT STORE ===
+"""Bounded on-disk store for generated files (audio) that sessions play back.
+
+Files live under ``root/<session>/<digest><suffix>`` and are evicted least
+recently used first when a session or the whole store exceeds its byte quota,
+or when they have not been used for ``ttl`` seconds. Sessions hold a
+``SessionArtifacts`` handle: clearing it, or the session being dropped and
+the handle garbage collected, deletes the session's files.
+
+When the root sits inside the app's ``static/`` folder and Streamlit's
+``server.enableStaticServing`` is on, ``url()`` lets the browser fetch a file
+straight from the web server instead of it passing through Python on every
+rerun.
+"""
+
+import collections
+import os
+import threading
+import time
+import weakref
+
+from smartconcept.cache import make_key
+
+# How often (seconds) put() looks for expired files
+SWEEP_INTERVAL = 60
+
+
+class ArtifactStore:
+    """Process-wide file store with per-session and global quotas."""
+
+    def __init__(self, root, max_bytes, session_max_bytes, ttl, url_prefix=None):
+        self.root = root
+        self.max_bytes = max_bytes
+        self.session_max_bytes = session_max_bytes
+        self.ttl = ttl
+        self.url_prefix = url_prefix
+        self._lock = threading.Lock()
+        # artifact id -> [session, size, last used], least recently used first
+        self._entries = collections.OrderedDict()
+        self._session_bytes = collections.Counter()
+        self._total_bytes = 0
+        self._last_sweep = time.time()
+        os.makedirs(root, exist_ok=True)
+        self._adopt_orphans()
+
+    def _adopt_orphans(self):
+        """Index files left by an earlier process so quotas and TTL cover them."""
+        found = []
+        for session in os.listdir(self.root):
+            folder = os.path.join(self.root, session)
+            if not os.path.isdir(folder):
+                continue
+            for name in os.listdir(folder):
+                path = os.path.join(folder, name)
+                if name.endswith(".tmp"):
+                    os.remove(path)
+                    continue
+                stat = os.stat(path)
+                found.append((stat.st_mtime, f"{session}/{name}", session, stat.st_size))
+        for used, artifact_id, session, size in sorted(found):
+            self._add(artifact_id, session, size, used)
+
+    def _path(self, artifact_id):
+        return os.path.join(self.root, *artifact_id.split("/"))
+
+    def _add(self, artifact_id, session, size, used):
+        self._entries[artifact_id] = [session, size, used]
+        self._session_bytes[session] += size
+        self._total_bytes += size
+
+    def _remove(self, artifact_id):
+        session, size, _ = self._entries.pop(artifact_id)
+        self._session_bytes[session] -= size
+        if self._session_bytes[session] <= 0:
+            del self._session_bytes[session]
+        self._total_bytes -= size
+        try:
+            os.remove(self._path(artifact_id))
+        except FileNotFoundError:
+            pass
+
+    def put(self, session, data, suffix=""):
+        """Store ``data`` for ``session`` and return its artifact id.
+
+        Identical data stored twice by one session shares a file. Older files
+        are evicted to make room, never the one just stored.
+        """
+        artifact_id = f"{session}/{make_key(data)[:24]}{suffix}"
+        with self._lock:
+            entry = self._entries.get(artifact_id)
+            if entry is not None and os.path.exists(self._path(artifact_id)):
+                entry[2] = time.time()
+                self._entries.move_to_end(artifact_id)
+                return artifact_id
+            if entry is not None:
+                self._remove(artifact_id)
+            path = self._path(artifact_id)
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            with open(f"{path}.tmp", "wb") as f:
+                f.write(data)
+            os.replace(f"{path}.tmp", path)
+            self._add(artifact_id, session, len(data), time.time())
+            self._evict(session, keep=artifact_id)
+        return artifact_id
+
+    def _evict(self, session, keep):
+        now = time.time()
+        if now - self._last_sweep >= SWEEP_INTERVAL:
+            self._last_sweep = now
+            for artifact_id, (_, _, used) in list(self._entries.items()):
+                if now - used > self.ttl and artifact_id != keep:
+                    self._remove(artifact_id)
+        for artifact_id, (owner, _, _) in list(self._entries.items()):
+            if self._session_bytes[session] <= self.session_max_bytes:
+                break
+            if owner == session and artifact_id != keep:
+                self._remove(artifact_id)
+        for artifact_id in list(self._entries):
+            if self._total_bytes <= self.max_bytes:
+                break
+            if artifact_id != keep:
+                self._remove(artifact_id)
+
+    def path(self, artifact_id):
+        """File path of an artifact (marking it used), or None once it was evicted."""
+        with self._lock:
+            entry = self._entries.get(artifact_id)
+            if entry is None:
+                return None
+            entry[2] = time.time()
+            self._entries.move_to_end(artifact_id)
+        return self._path(artifact_id)
+
+    def url(self, artifact_id):
+        """Static-serving URL of an artifact, or None if evicted or not served statically."""
+        if self.url_prefix is None or self.path(artifact_id) is None:
+            return None
+        return f"{self.url_prefix}/{artifact_id}"
+
+    def drop_session(self, session):
+        with self._lock:
+            for artifact_id in [a for a, (owner, _, _) in self._entries.items() if owner == session]:
+                self._remove(artifact_id)
+        try:
+            os.rmdir(os.path.join(self.root, session))
+        except OSError:
+            pass
+
+    def stats(self):
+        with self._lock:
+            return {
+                "files": len(self._entries),
+                "bytes": self._total_bytes,
+                "sessions": len(self._session_bytes),
+            }
+
+
+class SessionArtifacts:
+    """One session's view of the store; its files are deleted with it."""
+
+    def __init__(self, store, session):
+        self.store = store
+        self.session = session
+        # Runs on clear() or when Streamlit drops the session state holding this handle
+        self._finalizer = weakref.finalize(self, store.drop_session, session)
+
+    def put(self, data, suffix=""):
+        return self.store.put(self.session, data, suffix)
+
+    def path(self, artifact_id):
+        return self.store.path(artifact_id)
+
+    def url(self, artifact_id):
+        return self.store.url(artifact_id)
+
+    def clear(self):
+        self.store.drop_session(self.session)
@@ -0,0 +1,294 @@
+# === AUDIO FUNCTIONS ===
+"""Text-to-speech for explanations: cleaning, chunking, synthesis and assembly."""
+
+import io
+import re
+import time
+import zlib
+from concurrent.futures import ThreadPoolExecutor
+
+from smartconcept import config, reporting, resources, tracing, tts
+from smartconcept.cache import make_key
+from smartconcept.mp3 import iter_frames, join_mp3
+from smartconcept.normalize import normalize
+
+# Output profiles. "mp3" at 1.0x keeps MP3 chunks' own frames without re-encoding;
+# anything else is decoded, trimmed, sped up and encoded once with ffmpeg.
+AUDIO_PROFILES = {
+    "opus": {
+        "label": "Compact (Opus)", "format": "ogg", "suffix": ".ogg", "codec": "libopus", "bitrate": "20k",
+        # Speech tuning; complexity 5 encodes about twice as fast as the default 10 at the same size
+        "parameters": ["-application", "voip", "-compression_level", "5"],
+    },
+    "mp3": {
+        "label": "MP3 (most compatible)", "format": "mp3", "suffix": ".mp3", "codec": None, "bitrate": "32k",
+        "parameters": [],
+    },
+}
+# Joins WAV chunks from the local engines without needing ffmpeg
+WAV_OUTPUT = {"label": "WAV", "format": "wav", "suffix": ".wav", "codec": None, "bitrate": None, "parameters": []}
+AUDIO_TYPES = {".ogg": "audio/ogg", ".mp3": "audio/mpeg", ".wav": "audio/wav"}
+TEMPOS = (1.0, 1.25, 1.5)
+# Chunk edges quieter than this (dBFS) are trimmed, keeping TRIM_KEEP_MS
+SILENCE_THRESHOLD = -45.0
+TRIM_KEEP_MS = 40
+
+
+def clean_for_voice(text, lang):
+    text = normalize(text, "voice")
+    if lang == "te":
+        text = normalize(text, "voice-te")
+    return text
+
+def clean_telugu_text(text):
+    """Enhanced Telugu text cleaning for better TTS output"""
+    # Rule table lives in smartconcept.normalize and is compiled once per process
+    return normalize(text, "tts-te")
+
+def clean_english_text(text):
+    """Enhanced English text cleaning for better TTS output"""
+    return normalize(text, "tts-en")
+
+def get_backend(lang_code):
+    """The TTS backend configured for ``lang_code`` (see ``smartconcept.tts``)"""
+    return resources.get_tts_backend(tts.backend_name(lang_code))
+
+def synthesize_chunk(chunk, lang_code, slow, retries=config.TTS_RETRIES):
+    """Synthesize one text chunk into audio bytes, retrying transient failures"""
+    backend = get_backend(lang_code)
+    for attempt in range(retries + 1):
+        try:
+            with tracing.span(
+                "tts.synthesize", chars=len(chunk), lang=lang_code, backend=backend.name, attempt=attempt
+            ) as span:
+                data = backend.synthesize(chunk, lang_code, slow)
+                span.set(bytes=len(data))
+            return data
+        except Exception:
+            if attempt == retries:
+                raise
+            time.sleep(0.5 * 2 ** attempt)
+
+def cached_synthesize_chunk(chunk, lang_code, slow):
+    """Synthesize a chunk, reusing audio already produced for identical text and options"""
+    cache = resources.get_tts_cache()
+    cache_key = make_key("tts", config.TTS_CACHE_VERSION, get_backend(lang_code).key, chunk, lang_code, slow)
+    with tracing.span("tts.chunk", chars=len(chunk), cache_hit=True) as span:
+        def compute():
+            span.set(cache_hit=False)
+            return synthesize_chunk(chunk, lang_code, slow)
+        return cache.get_or_compute(cache_key, compute)
+
+def split_tts_chunks(text, chunk_size=1000, min_chunk=300):
+    """Split cleaned text into sentence-aligned chunks of under ``chunk_size`` chars.
+
+    Chunk boundaries are chosen from the sentences themselves (content-defined),
+    so editing one sentence only changes the chunks around it and the rest keep
+    hitting the audio cache.
+    """
+    sentences = re.split(r'(?<=[.!?])\s+', text)
+    chunks = []
+    current_chunk = ""
+    for sentence in sentences:
+        if current_chunk and len(current_chunk) + len(sentence) >= chunk_size:
+            chunks.append(current_chunk.strip())
+            current_chunk = ""
+        current_chunk += " " + sentence
+        if len(current_chunk) >= min_chunk and zlib.crc32(sentence.encode("utf-8")) % 4 == 0:
+            chunks.append(current_chunk.strip())
+            current_chunk = ""
+    if current_chunk.strip():
+        chunks.append(current_chunk.strip())
+    return chunks
+
+def audio_type(data):
+    """``(suffix, mime type)`` of generated audio, from its first bytes"""
+    if data[:4] == b"OggS":
+        suffix = ".ogg"
+    elif data[:4] == b"RIFF":
+        suffix = ".wav"
+    else:
+        suffix = ".mp3"
+    return suffix, AUDIO_TYPES[suffix]
+
+def assemble_audio(parts, pause_ms=300, profile="mp3", tempo=1.0, part_format="mp3"):
+    """Join ``part_format`` chunks into one file in ``profile``, played back at ``tempo``.
+
+    MP3 chunks wanted as MP3 at 1.0x are joined frame by frame with
+    ``pause_ms`` of silence between them when they share a format. Otherwise
+    the chunks are decoded (MP3 chunks together, in one ffmpeg run), their
+    edge silence trimmed, and the result is sped up (pitch preserved) and
+    encoded in one more ffmpeg run. ``profile``
+    "wav" joins WAV chunks as WAV, which needs no ffmpeg.
+    """
+    if part_format == profile == "mp3" and tempo == 1.0:
+        with tracing.span("audio.join", parts=len(parts)) as span:
+            joined = join_mp3(parts, pause_ms=pause_ms)
+            span.set(joined=joined is not None)
+        if joined is not None:
+            return joined
+
+    settings = WAV_OUTPUT if profile == "wav" else AUDIO_PROFILES[profile]
+    with tracing.span("audio.reencode", parts=len(parts), tempo=tempo) as span:
+        output = _reencode(parts, pause_ms, settings, tempo, part_format)
+        span.set(bytes=len(output))
+        return output
+
+def trim_silence(segment, threshold=SILENCE_THRESHOLD, keep_ms=TRIM_KEEP_MS):
+    """Cut leading/trailing silence from a pydub segment, keeping ``keep_ms`` of it"""
+    from pydub.silence import detect_leading_silence
+
+    start = max(0, detect_leading_silence(segment, threshold) - keep_ms)
+    end = len(segment) - max(0, detect_leading_silence(segment.reverse(), threshold) - keep_ms)
+    return segment[start:end] if end > start else segment
+
+def decode_mp3_parts(parts):
+    """Decode MP3 chunks with a single ffmpeg run; returns one pydub segment per chunk.
+
+    The chunks are joined frame by frame and decoded together, then cut apart
+    again at the sample offsets given by each chunk's frame count. Returns None
+    when the chunks do not share one format.
+    """
+    from pydub import AudioSegment
+
+    joined = join_mp3(parts)
+    if joined is None:
+        return None
+    # Passing the codec skips the ffprobe run and keeps the decode on pipes
+    whole = AudioSegment.from_file(io.BytesIO(joined), format="mp3", codec="mp3")
+    total = int(whole.frame_count())
+    segments = []
+    start = 0
+    for index, part in enumerate(parts):
+        end = total if index == len(parts) - 1 else min(total, start + sum(h.samples for h, _ in iter_frames(part)))
+        segments.append(whole.get_sample_slice(start, end))
+        start = end
+    return segments
+
+def _reencode(parts, pause_ms, settings, tempo, part_format="mp3"):
+    from pydub import AudioSegment
+
+    segments = decode_mp3_parts(parts) if part_format == "mp3" else None
+    if segments is None:
+        # WAV is parsed in-process; only MP3 chunks of mixed formats are decoded one by one
+        segments = [AudioSegment.from_file(io.BytesIO(part), format=part_format) for part in parts]
+    segments = [trim_silence(segment) for segment in segments]
+    first = segments[0]
+    silence = AudioSegment.silent(duration=pause_ms, frame_rate=first.frame_rate)
+    raw = []
+    for i, segment in enumerate(segments):
+        if i:
+            raw.append(silence.set_channels(first.channels).set_sample_width(first.sample_width).raw_data)
+        raw.append(
+            segment.set_frame_rate(first.frame_rate)
+            .set_channels(first.channels)
+            .set_sample_width(first.sample_width)
+            .raw_data
+        )
+    # Join raw PCM once instead of growing an AudioSegment with +=
+    combined = first._spawn(b"".join(raw)).set_channels(1)
+    parameters = list(settings["parameters"])
+    if tempo != 1.0:
+        # atempo changes speed without changing pitch
+        parameters += ["-filter:a", f"atempo={tempo}"]
+    output = io.BytesIO()
+    combined.export(
+        output, format=settings["format"], codec=settings["codec"], bitrate=settings["bitrate"],
+        # No parameters lets pydub write WAV itself
+        parameters=parameters or None,
+    )
+    return output.getvalue()
+
+def audio_job(job, concept, text, lang, profile=None, tempo=None):
+    """Job body for ``JobQueue``: synthesize the audio for one explanation."""
+    job.set_progress(0.1, "Generating audio")
+    audio_bytes = generate_high_quality_audio(text, lang, profile=profile, tempo=tempo, strict=True)
+    if audio_bytes is None:
+        raise RuntimeError("no audio was produced (empty text?)")
+    return {"concept": concept, "lang": lang, "audio": audio_bytes}
+
+def generate_high_quality_audio(text, lang, max_workers=None, profile=None, tempo=None, strict=False):
+    """Generate high quality audio for both Telugu and English
+
+    Chunks are synthesized in parallel by up to ``max_workers`` threads
+    (defaults to ``TTS_MAX_WORKERS``). ``profile`` (a key of ``AUDIO_PROFILES``)
+    and ``tempo`` default to ``AUDIO_PROFILE``/``AUDIO_TEMPO``; the finished
+    file is cached for each combination. If ffmpeg cannot produce the profile
+    the chunks are joined in the backend's own format (MP3 or WAV) instead.
+    Returns the audio as bytes, or None; with ``strict`` failures raise instead.
+    """
+    profile = profile or config.AUDIO_PROFILE
+    tempo = float(tempo or config.AUDIO_TEMPO)
+    with tracing.span("audio", lang=lang, tempo=tempo) as span:
+        try:
+            # Configuration
+            lang_code = "te" if lang == "Telugu" else "en"
+            slow_speech = False  # Better clarity
+            chunk_size = 1000 # Smaller chunks for better processing
+        
+            # Clean text based on language
+            cleaned_text = clean_telugu_text(text) if lang == "Telugu" else clean_english_text(text)
+
+            backend = get_backend(lang_code)
+            span.set(backend=backend.name)
+            cache = resources.get_tts_cache()
+            cache_key = make_key(
+                "audio", config.TTS_CACHE_VERSION, backend.key, cleaned_text, lang_code, slow_speech, profile, tempo
+            )
+            cached = cache.get(cache_key)
+            span.set(cache_hit=cached is not None)
+            if cached is not None:
+                span.set(bytes=len(cached))
+                return cached
+        
+            # Split into sentence-aligned chunks
+            chunks = split_tts_chunks(cleaned_text, chunk_size)
+            span.set(chunks=len(chunks), chars=len(cleaned_text))
+        
+            # Synthesize chunks concurrently; results come back in chunk order
+            workers = max(1, min(max_workers or config.TTS_MAX_WORKERS, len(chunks) or 1))
+            with ThreadPoolExecutor(max_workers=workers) as pool:
+                futures = [
+                    pool.submit(cached_synthesize_chunk, chunk, lang_code, slow_speech)
+                    for chunk in chunks if chunk
+                ]
+
+            audio_parts = []
+            for future in futures:
+                try:
+                    audio_parts.append(future.result())
+                except Exception as e:
+                    reporting.warning(f"Could not process one audio segment: {str(e)}")
+            if strict and not audio_parts and futures:
+                # Every chunk failed; the last error is the real cause
+                futures[-1].result()
+        
+            # Combine all audio segments in memory
+            if audio_parts:
+                try:
+                    audio_bytes = assemble_audio(
+                        audio_parts, pause_ms=300, profile=profile, tempo=tempo, part_format=backend.format
+                    )
+                except Exception as e:
+                    # Usually ffmpeg (or its Opus encoder) is missing; don't cache the stand-in
+                    reporting.logger.warning(
+                        "Audio profile %s at %sx failed, using %s: %s", profile, tempo, backend.format, e
+                    )
+                    audio_bytes = assemble_audio(
+                        audio_parts, pause_ms=300, profile=backend.format, part_format=backend.format
+                    )
+                else:
+                    # A missing chunk may be a passing TTS error; don't keep the gap forever
+                    if len(audio_parts) == len(futures):
+                        cache.set(cache_key, audio_bytes)
+                span.set(bytes=len(audio_bytes), missing_chunks=len(futures) - len(audio_parts))
+                return audio_bytes
+        
+            return None
+    
+        except Exception as e:
+            span.error = type(e).__name__
+            if strict:
+                raise
+            reporting.error(f"Audio generation failed: {str(e)}")
+            return None
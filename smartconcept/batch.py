@@ -0,0 +1,35 @@
+# === BATCH PIPELINE ===
+"""Run one function over many items with bounded concurrency."""
+
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+
+def run_batch(items, func, max_workers=4, on_progress=None, thread_initializer=None):
+    """Apply ``func`` to every item using at most ``max_workers`` threads.
+
+    Returns a list of ``(item, result, error)`` tuples in input order. Exceptions
+    raised by ``func`` are captured per item instead of aborting the batch.
+    ``on_progress(done, total, item, result, error)`` is called from the calling
+    thread as each item finishes, so it is safe to update UI widgets from it.
+    ``thread_initializer`` runs once in each worker thread before any item.
+    """
+    items = list(items)
+    results = [None] * len(items)
+    if not items:
+        return results
+
+    with ThreadPoolExecutor(
+        max_workers=max(1, min(max_workers, len(items))),
+        initializer=thread_initializer,
+    ) as pool:
+        futures = {pool.submit(func, item): index for index, item in enumerate(items)}
+        for done, future in enumerate(as_completed(futures), start=1):
+            index = futures[future]
+            try:
+                result, error = future.result(), None
+            except Exception as e:
+                result, error = None, e
+            results[index] = (items[index], result, error)
+            if on_progress:
+                on_progress(done, len(items), items[index], result, error)
+    return results
@@ -0,0 +1,128 @@
+# === CHAT ENGINE ===
+"""Document Q&A with conversation memory kept inside a token budget.
+
+Every question is sent with the most relevant passages of the document, a
+running summary of older turns and as many recent turns as fit in
+``CHAT_HISTORY_TOKENS``. Once the unsummarized turns outgrow that budget the
+oldest ones are folded into the summary with one extra Gemini call, so the
+prompt stays bounded however long the conversation gets.
+
+The engine is stateless: the caller keeps the turns, the summary and how many
+turns it covers (the app keeps them in session state), and every session
+shares the process-wide Gemini client.
+"""
+
+from smartconcept import config, reporting, resources, tracing
+from smartconcept.cache import make_key
+from smartconcept.gemini import CHARS_PER_TOKEN
+
+
+def estimate_tokens(text):
+    return len(text) // CHARS_PER_TOKEN + 1
+
+
+def turn_text(turn):
+    return f"Student: {turn['user']}\nAssistant: {turn['assistant']}"
+
+
+def recent_turns(turns, budget_tokens):
+    """The longest run of trailing ``turns`` that fits in ``budget_tokens``."""
+    used = 0
+    start = len(turns)
+    while start > 0:
+        used += estimate_tokens(turn_text(turns[start - 1]))
+        if used > budget_tokens:
+            break
+        start -= 1
+    return turns[start:]
+
+
+def retrieval_query(question, history):
+    """Search query for the document passages; follow-ups ("and why?") borrow the previous question."""
+    if history:
+        return f"{history[-1]['user']} {question}"
+    return question
+
+
+def build_prompt(question, context, summary="", turns=()):
+    parts = [f"Context: {context}"]
+    if summary:
+        parts.append(f"Summary of the earlier conversation:\n{summary}")
+    if turns:
+        parts.append("Recent conversation:\n" + "\n\n".join(turn_text(turn) for turn in turns))
+    parts.append(f"Question: {question}")
+    return "\n\n".join(parts)
+
+
+def answer_key(doc_key, question, history):
+    """Cache key for an answer.
+
+    Only the previous turn is part of the key: a question asked at the start
+    of a conversation (or right after the same exchange) is answered from the
+    cache for every session, while a follow-up stays tied to what it follows.
+    """
+    previous = turn_text(history[-1]) if history else ""
+    normalized = " ".join(question.lower().split())
+    return make_key("chat", config.CHAT_PROMPT_VERSION, doc_key, normalized, previous)
+
+
+def stream_answer(question, context, doc_key, history, summary="", summarized=0):
+    """Yield the answer to ``question`` as it arrives.
+
+    ``history`` is the full list of ``{"user", "assistant"}`` turns and
+    ``summary`` covers its first ``summarized`` turns. Repeated questions are
+    served from the LLM cache in a single chunk.
+    """
+    cache = resources.get_llm_cache()
+    key = answer_key(doc_key, question, history)
+    with tracing.span("chat", history_turns=len(history)) as span:
+        cached = cache.get(key)
+        span.set(cache_hit=cached is not None)
+        if cached is not None:
+            yield cached
+            return
+
+        turns = recent_turns(history[summarized:], config.CHAT_HISTORY_TOKENS)
+        prompt = build_prompt(question, context, summary, turns)
+        parts = []
+        with tracing.span("llm.chat", prompt_chars=len(prompt), turns=len(turns)) as call:
+            for text in resources.get_gemini_client().stream(prompt):
+                parts.append(text)
+                yield text
+            call.set(response_chars=sum(len(part) for part in parts))
+        cache.set(key, "".join(parts))
+
+
+def compact(history, summary, summarized):
+    """Fold the oldest unsummarized turns into the summary once they exceed the budget.
+
+    Returns the new ``(summary, summarized)``; both are unchanged while the
+    recent turns still fit, or if summarizing fails.
+    """
+    pending = history[summarized:]
+    if sum(estimate_tokens(turn_text(turn)) for turn in pending) <= config.CHAT_HISTORY_TOKENS:
+        return summary, summarized
+    # Keep the newest half of the budget verbatim so compaction is not needed every turn
+    keep = recent_turns(pending, config.CHAT_HISTORY_TOKENS // 2)
+    fold = pending[:len(pending) - len(keep)]
+    words = config.CHAT_SUMMARY_TOKENS * 3 // 4
+    new_turns = "\n\n".join(turn_text(turn) for turn in fold)
+    prompt = f"""
+Update the summary of a tutoring conversation about a lecture document.
+Keep the topics discussed, what the student asked and the key facts and answers given.
+Write plain sentences, at most {words} words.
+
+Current summary:
+{summary or "(none)"}
+
+New turns:
+{new_turns}
+"""
+    try:
+        with tracing.span("llm.chat_summary", prompt_chars=len(prompt), turns=len(fold)) as span:
+            new_summary = resources.get_gemini_client().generate(prompt).strip()
+            span.set(response_chars=len(new_summary))
+    except Exception as e:
+        reporting.logger.warning("Chat summary skipped: %s", e)
+        return summary, summarized
+    return new_summary[:config.CHAT_SUMMARY_TOKENS * CHARS_PER_TOKEN], summarized + len(fold)
@@ -0,0 +1,333 @@
+# === BATCH CLI ===
+"""Precompute explanations, audio and PDFs for a directory of lecture files.
+
+    python -m smartconcept.cli lectures/ --output bundles/ --lang English,Telugu --audio
+
+Documents are spread over a process pool. Inside each process the Gemini and
+TTS calls run on a bounded thread pool. Every document gets its own output
+bundle::
+
+    bundles/<name>-<hash>/
+        manifest.json            source, concepts, per-language status and audio files
+        <lang>/NN-<concept>.md   one explanation per concept
+        <lang>/NN-<concept>.ogg  audio (with --audio; .mp3/.wav depending on profile and engine)
+        <lang>/explanations.pdf
+
+Each file is written atomically as soon as it is ready. A re-run skips
+finished documents and, for unfinished ones, only produces the missing
+files.
+"""
+
+import argparse
+import json
+import logging
+import multiprocessing
+import os
+import re
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from smartconcept import config
+from smartconcept.audio import AUDIO_PROFILES, AUDIO_TYPES, TEMPOS
+
+DOCUMENT_TYPES = (".pdf", ".pptx")
+MANIFEST_VERSION = 1
+
+
+def find_documents(root, recursive=False):
+    """PDF/PPTX files under ``root``, sorted for a stable processing order."""
+    if recursive:
+        paths = [os.path.join(folder, name) for folder, _, names in os.walk(root) for name in names]
+    else:
+        paths = [os.path.join(root, name) for name in os.listdir(root)]
+    return sorted(
+        path for path in paths
+        if os.path.isfile(path) and path.lower().endswith(DOCUMENT_TYPES)
+    )
+
+
+def slugify(text, limit=60):
+    slug = re.sub(r"[^\w]+", "-", text, flags=re.UNICODE).strip("-").lower()
+    return slug[:limit] or "concept"
+
+
+def write_atomic(path, data):
+    """Write ``data`` (str or bytes) so readers never see a partial file."""
+    tmp = f"{path}.tmp"
+    mode = "wb" if isinstance(data, (bytes, bytearray)) else "w"
+    with open(tmp, mode, **({} if mode == "wb" else {"encoding": "utf-8"})) as f:
+        f.write(data)
+    os.replace(tmp, path)
+
+
+def read_manifest(bundle):
+    try:
+        with open(os.path.join(bundle, "manifest.json"), encoding="utf-8") as f:
+            manifest = json.load(f)
+    except (OSError, ValueError):
+        return None
+    return manifest if manifest.get("version") == MANIFEST_VERSION else None
+
+
+def write_manifest(bundle, manifest):
+    write_atomic(os.path.join(bundle, "manifest.json"), json.dumps(manifest, indent=2, ensure_ascii=False))
+
+
+# === WORKER PROCESS ===
+def init_worker(gemini_rpm, gemini_tpm, log_level):
+    """Runs once per worker process, before any pipeline resource is created."""
+    logging.basicConfig(level=log_level, format="%(processName)s %(levelname)s %(message)s")
+    # Each process has its own rate limiters; split the quota between them
+    config.GEMINI_RPM = gemini_rpm
+    config.GEMINI_TPM = gemini_tpm
+    # Documents are already spread over processes, so extract pages in-process
+    config.EXTRACT_WORKERS = 1
+
+
+def process_document(path, output_root, options):
+    """Build (or finish) the bundle for one document; returns a summary dict."""
+    from smartconcept import audio, documents, export, llm
+    from smartconcept.batch import run_batch
+    from smartconcept.retrieval import BM25Index, split_passages
+
+    started = time.perf_counter()
+    with open(path, "rb") as f:
+        data = f.read()
+    doc_key = documents.fingerprint(data)
+    name = os.path.basename(path)
+    bundle = os.path.join(output_root, f"{os.path.splitext(name)[0]}-{doc_key[:10]}")
+    summary = {"path": path, "bundle": bundle, "status": "complete", "errors": []}
+
+    manifest = previous = read_manifest(bundle)
+    wanted = {
+        "languages": options["languages"],
+        "audio": options["audio"],
+        "audio_profile": options["audio_profile"],
+        "tempo": options["tempo"],
+        "max_concepts": options["max_concepts"],
+    }
+    if manifest and manifest.get("complete") and manifest.get("options") == wanted:
+        summary["status"] = "skipped"
+        return summary
+
+    os.makedirs(bundle, exist_ok=True)
+    pages, (structure, source) = documents.load_document(data, name, doc_key)
+
+    if manifest and manifest.get("concepts") and manifest.get("options", {}).get("max_concepts") == options["max_concepts"]:
+        concepts, source = manifest["concepts"], manifest["concept_source"]
+    else:
+        concepts = structure
+        if not concepts:
+            concepts, source = llm.identify_concepts("\n".join(pages)), "Gemini"
+        if options["max_concepts"]:
+            concepts = concepts[:options["max_concepts"]]
+    if not concepts:
+        summary["status"] = "failed"
+        summary["errors"].append("no concepts found")
+        return summary
+
+    manifest = {
+        "version": MANIFEST_VERSION,
+        "source": name,
+        "doc_key": doc_key,
+        "pages": len(pages),
+        "concept_source": source,
+        "concepts": concepts,
+        "options": wanted,
+        "languages": {},
+        "complete": False,
+    }
+    write_manifest(bundle, manifest)
+
+    index = BM25Index(split_passages(pages))
+
+    def context_for(concept):
+        return index.context_for(concept, budget_chars=config.EXPLAIN_CONTEXT_CHARS, k=config.RETRIEVAL_TOP_K)
+
+    complete = True
+    for lang in options["languages"]:
+        folder = os.path.join(bundle, slugify(lang))
+        os.makedirs(folder, exist_ok=True)
+        stems = {concept: f"{number:02d}-{slugify(concept)}" for number, concept in enumerate(concepts, start=1)}
+        explanation_path = {c: os.path.join(folder, f"{stem}.md") for c, stem in stems.items()}
+        audio_stem = {c: os.path.join(folder, stem) for c, stem in stems.items()}
+        # Audio only counts as done if it was made with the current profile and tempo
+        audio_options = {"profile": options["audio_profile"], "tempo": options["tempo"]}
+        audio_suffix = AUDIO_PROFILES[options["audio_profile"]]["suffix"]
+        previous_audio = ((previous or {}).get("languages", {}).get(lang) or {}).get("audio_files", {})
+        audio_files = {
+            concept: record for concept, record in previous_audio.items()
+            if concept in stems
+            and record == {"file": os.path.basename(audio_stem[concept] + audio_suffix), **audio_options}
+            and os.path.exists(audio_stem[concept] + audio_suffix)
+        }
+
+        def has_audio(concept):
+            return concept in audio_files
+
+        def clear_audio(concept):
+            for suffix in AUDIO_TYPES:
+                if os.path.exists(audio_stem[concept] + suffix):
+                    os.remove(audio_stem[concept] + suffix)
+
+        def save_explanation(done, total, concept, result, error):
+            if error is None:
+                write_atomic(explanation_path[concept], f"# {concept}\n\n{result[0]}\n")
+            else:
+                summary["errors"].append(f"{lang} / {concept}: {error}")
+
+        missing = [c for c in concepts if not os.path.exists(explanation_path[c])]
+        llm.explain_all_concepts(
+            missing, context_for, lang,
+            max_workers=options["io_workers"], on_progress=save_explanation, strict=True,
+            batch_size=options["batch_size"],
+        )
+
+        explanations = {}
+        for concept in concepts:
+            if os.path.exists(explanation_path[concept]):
+                with open(explanation_path[concept], encoding="utf-8") as f:
+                    explanations[concept] = f.read().split("\n\n", 1)[1].rstrip("\n")
+
+        if options["audio"]:
+            def save_audio(done, total, concept, audio_bytes, error):
+                if not audio_bytes:
+                    summary["errors"].append(f"{lang} / {concept}: audio failed ({error or 'no audio'})")
+                    return
+                suffix, _ = audio.audio_type(audio_bytes)
+                write_atomic(audio_stem[concept] + suffix, audio_bytes)
+                if suffix == audio_suffix:
+                    audio_files[concept] = {"file": os.path.basename(audio_stem[concept] + suffix), **audio_options}
+                else:
+                    # Kept for listening, but redone on the next run
+                    summary["errors"].append(f"{lang} / {concept}: audio saved as {suffix}, not {audio_suffix} (ffmpeg missing?)")
+
+            missing = [c for c in explanations if not has_audio(c)]
+            # Files from other profiles/tempos are stale
+            for concept in missing:
+                clear_audio(concept)
+            # One TTS request per concept at a time keeps the total at io_workers
+            run_batch(
+                missing,
+                lambda concept: audio.generate_high_quality_audio(
+                    explanations[concept], lang, max_workers=1,
+                    profile=options["audio_profile"], tempo=options["tempo"],
+                ),
+                max_workers=options["io_workers"],
+                on_progress=save_audio,
+            )
+
+        pdf_path = os.path.join(folder, "explanations.pdf")
+        lang_complete = len(explanations) == len(concepts) and (
+            not options["audio"] or all(has_audio(c) for c in concepts)
+        )
+        if len(explanations) == len(concepts) and not os.path.exists(pdf_path):
+            try:
+                write_atomic(pdf_path, export.build_explanations_pdf(tuple(explanations.items())))
+            except Exception as e:
+                summary["errors"].append(f"{lang} / PDF export: {e}")
+        lang_complete = lang_complete and os.path.exists(pdf_path)
+        manifest["languages"][lang] = {
+            "explained": len(explanations),
+            "audio": len(audio_files),
+            "audio_files": audio_files,
+            "complete": lang_complete,
+        }
+        complete = complete and lang_complete
+
+    manifest["complete"] = complete
+    write_manifest(bundle, manifest)
+    summary["status"] = "complete" if complete else "partial"
+    summary["seconds"] = round(time.perf_counter() - started, 2)
+    return summary
+
+
+# === ENTRY POINT ===
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(
+        prog="python -m smartconcept.cli",
+        description="Precompute explanations, audio and PDFs for a directory of PDF/PPTX files.",
+    )
+    parser.add_argument("input", help="directory containing .pdf/.pptx files")
+    parser.add_argument("-o", "--output", help="bundle directory (default: <input>/smartconcept-output)")
+    parser.add_argument("-r", "--recursive", action="store_true", help="also search subdirectories")
+    parser.add_argument("--lang", default="English", help="comma-separated: English,Telugu")
+    parser.add_argument("--audio", action="store_true", help="also synthesize audio")
+    parser.add_argument("--audio-profile", choices=sorted(AUDIO_PROFILES), default=config.AUDIO_PROFILE,
+                        help="audio format (default: %(default)s)")
+    parser.add_argument("--tempo", type=float, choices=TEMPOS, default=config.AUDIO_TEMPO,
+                        help="voice speed baked into the audio (default: %(default)s)")
+    parser.add_argument("--max-concepts", type=int, default=0, help="explain at most N concepts per document")
+    parser.add_argument("-p", "--processes", type=int, default=0, help="documents in parallel (default: CPU count)")
+    parser.add_argument("--io-workers", type=int, default=config.BATCH_MAX_WORKERS,
+                        help="concurrent Gemini/TTS requests per process")
+    parser.add_argument("--batch-size", type=int, default=config.EXPLAIN_BATCH_SIZE,
+                        help="concepts explained per Gemini request (1 = one request each)")
+    parser.add_argument("-v", "--verbose", action="store_true")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    log_level = logging.INFO if args.verbose else logging.WARNING
+    logging.basicConfig(level=log_level, format="%(levelname)s %(message)s")
+
+    languages = [lang.strip() for lang in args.lang.split(",") if lang.strip()]
+    unknown = [lang for lang in languages if lang not in ("English", "Telugu")]
+    if unknown:
+        sys.exit(f"Unsupported language(s): {', '.join(unknown)}")
+
+    paths = find_documents(args.input, args.recursive)
+    if not paths:
+        sys.exit(f"No PDF/PPTX files found in {args.input}")
+    output_root = args.output or os.path.join(args.input, "smartconcept-output")
+    os.makedirs(output_root, exist_ok=True)
+
+    processes = max(1, min(args.processes or os.cpu_count() or 1, len(paths)))
+    # Every process gets its own share of the Gemini quota; more processes than
+    # requests per minute (or than full-size requests per minute of tokens)
+    # would push the shares, and so the total, above the quota
+    quota_processes = max(1, min(config.GEMINI_RPM, config.GEMINI_TPM // (config.GEMINI_OUTPUT_TOKENS * 2)))
+    if processes > quota_processes:
+        logging.warning("Using %d processes to stay within the Gemini quota", quota_processes)
+        processes = quota_processes
+    options = {
+        "languages": languages,
+        "audio": args.audio,
+        "audio_profile": args.audio_profile,
+        "tempo": args.tempo,
+        "max_concepts": args.max_concepts,
+        "io_workers": max(1, args.io_workers),
+        "batch_size": max(1, args.batch_size),
+    }
+    gemini_rpm = config.GEMINI_RPM / processes
+    gemini_tpm = max(config.GEMINI_OUTPUT_TOKENS * 2, config.GEMINI_TPM // processes)
+
+    print(f"Processing {len(paths)} document(s) with {processes} process(es) -> {output_root}")
+    counts = {}
+    with ProcessPoolExecutor(
+        max_workers=processes,
+        mp_context=multiprocessing.get_context("spawn"),
+        initializer=init_worker,
+        initargs=(gemini_rpm, gemini_tpm, log_level),
+    ) as pool:
+        futures = {pool.submit(process_document, path, output_root, options): path for path in paths}
+        for done, future in enumerate(as_completed(futures), start=1):
+            path = futures[future]
+            try:
+                summary = future.result()
+            except Exception as e:
+                summary = {"status": "failed", "errors": [repr(e)]}
+            counts[summary["status"]] = counts.get(summary["status"], 0) + 1
+            seconds = f" in {summary['seconds']}s" if "seconds" in summary else ""
+            print(f"[{done}/{len(paths)}] {summary['status']}{seconds}: {os.path.basename(path)}")
+            for error in summary["errors"]:
+                print(f"    {error}")
+
+    print(", ".join(f"{count} {status}" for status, count in sorted(counts.items())))
+    return 0 if counts.keys() <= {"complete", "skipped"} else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
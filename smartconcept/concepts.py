@@ -0,0 +1,59 @@
+# === CONCEPT LIST HELPERS ===
+"""Parsing, windowing and merging helpers for concept identification."""
+
+import re
+
+
+def parse_concept_list(response_text):
+    """Parse a numbered "1. Topic" list returned by the model."""
+    clean = []
+    for line in response_text.strip().split("\n"):
+        if ". " in line:
+            content = line.split(". ", 1)[1].strip()
+            if len(content) > 5 and not re.fullmatch(r"[0-9. ]+", content):
+                clean.append(content)
+    return clean
+
+
+def split_windows(text, size=10000, overlap=500):
+    """Split ``text`` into windows of about ``size`` chars, breaking on line ends.
+
+    Consecutive windows share ``overlap`` chars so headings on a boundary are
+    seen in full by at least one window.
+    """
+    if len(text) <= size:
+        return [text]
+    windows = []
+    start = 0
+    while start < len(text):
+        end = min(start + size, len(text))
+        if end < len(text):
+            newline = text.rfind("\n", start + size // 2, end)
+            if newline != -1:
+                end = newline
+        windows.append(text[start:end])
+        if end >= len(text):
+            break
+        start = max(end - overlap, start + 1)
+    return windows
+
+
+def concept_signature(concept):
+    """Normalised form used to detect near-duplicate concepts."""
+    words = re.findall(r"\w+", concept.lower())
+    # Treat simple plurals as the same topic ("Permutation" / "Permutations")
+    return " ".join(w[:-1] if len(w) > 3 and w.endswith("s") and not w.endswith("ss") else w
+                    for w in words)
+
+
+def merge_concepts(concept_lists):
+    """Merge per-window concept lists, dropping duplicates and keeping first-seen order."""
+    merged = []
+    seen = set()
+    for concepts in concept_lists:
+        for concept in concepts:
+            signature = concept_signature(concept)
+            if signature and signature not in seen:
+                seen.add(signature)
+                merged.append(concept)
+    return merged
@@ -0,0 +1,103 @@
+# === CONFIG ===
+"""Settings shared by the Streamlit app, batch tools and benchmarks.
+
+Every knob can be overridden with a ``SMARTCONCEPT_*`` environment variable.
+"""
+
+import os
+
+from smartconcept.cache import DEFAULT_CACHE_DIR
+
+
+def _int(name, default):
+    return int(os.environ.get(name, default))
+
+
+# Only ever read from the environment; never commit a key
+GEMINI_API_KEY = os.environ.get("GEMINI_API_KEY")
+GEMINI_MODEL_NAME = os.environ.get("SMARTCONCEPT_GEMINI_MODEL", "gemini-1.5-flash")
+
+# Bump these whenever the corresponding prompt text changes so stale cached
+# results are not served for the new template.
+IDENTIFY_PROMPT_VERSION = "1"
+EXPLAIN_PROMPT_VERSION = "1"
+CHAT_PROMPT_VERSION = "1"
+# Bump when extraction output changes so cached pages are re-extracted
+EXTRACT_VERSION = "1"
+# Bump when TTS settings change in a way the cache key does not capture
+TTS_CACHE_VERSION = "1"
+
+CACHE_DIR = DEFAULT_CACHE_DIR
+LLM_CACHE_BYTES = _int("SMARTCONCEPT_LLM_CACHE_BYTES", 256 * 1024 * 1024)
+LLM_CACHE_TTL = _int("SMARTCONCEPT_LLM_CACHE_TTL", 30 * 24 * 3600)
+EXTRACT_CACHE_BYTES = _int("SMARTCONCEPT_EXTRACT_CACHE_BYTES", 512 * 1024 * 1024)
+EXTRACT_CACHE_TTL = _int("SMARTCONCEPT_EXTRACT_CACHE_TTL", 30 * 24 * 3600)
+TTS_CACHE_BYTES = _int("SMARTCONCEPT_TTS_CACHE_BYTES", 1024 * 1024 * 1024)
+TTS_CACHE_TTL = _int("SMARTCONCEPT_TTS_CACHE_TTL", 30 * 24 * 3600)
+
+# Requests per minute allowed by our Gemini API quota
+GEMINI_RPM = _int("SMARTCONCEPT_GEMINI_RPM", 15)
+# Tokens per minute (prompt + response) allowed by the same quota
+GEMINI_TPM = _int("SMARTCONCEPT_GEMINI_TPM", 1_000_000)
+# Output tokens assumed per call when budgeting TPM before the real usage is known
+GEMINI_OUTPUT_TOKENS = _int("SMARTCONCEPT_GEMINI_OUTPUT_TOKENS", 1500)
+# Retries for 429s and transient server errors, with exponential backoff (seconds)
+GEMINI_MAX_RETRIES = _int("SMARTCONCEPT_GEMINI_MAX_RETRIES", 4)
+GEMINI_BACKOFF = float(os.environ.get("SMARTCONCEPT_GEMINI_BACKOFF", 1.0))
+GEMINI_MAX_BACKOFF = float(os.environ.get("SMARTCONCEPT_GEMINI_MAX_BACKOFF", 30.0))
+BATCH_MAX_WORKERS = _int("SMARTCONCEPT_BATCH_WORKERS", 4)
+
+EXTRACT_WORKERS = _int("SMARTCONCEPT_EXTRACT_WORKERS", 0) or None
+
+# Character budgets for the passages sent along with each prompt
+EXPLAIN_CONTEXT_CHARS = _int("SMARTCONCEPT_EXPLAIN_CONTEXT_CHARS", 6000)
+CHAT_CONTEXT_CHARS = _int("SMARTCONCEPT_CHAT_CONTEXT_CHARS", 2000)
+# Chat memory: recent turns sent verbatim, older ones folded into a summary
+CHAT_HISTORY_TOKENS = _int("SMARTCONCEPT_CHAT_HISTORY_TOKENS", 1500)
+CHAT_SUMMARY_TOKENS = _int("SMARTCONCEPT_CHAT_SUMMARY_TOKENS", 300)
+RETRIEVAL_TOP_K = _int("SMARTCONCEPT_RETRIEVAL_TOP_K", 8)
+# Concepts explained per Gemini request by "Explain all" and the batch CLI;
+# larger batches resend the context less often but take longer per response
+EXPLAIN_BATCH_SIZE = _int("SMARTCONCEPT_EXPLAIN_BATCH_SIZE", 4)
+# Documents whose BM25 index is kept in memory
+RETRIEVAL_INDEX_ENTRIES = _int("SMARTCONCEPT_RETRIEVAL_INDEX_ENTRIES", 32)
+
+# Documents longer than one window are processed map-reduce style
+CONCEPT_WINDOW_CHARS = _int("SMARTCONCEPT_CONCEPT_WINDOW_CHARS", 10000)
+CONCEPT_WINDOW_OVERLAP = 500
+CONCEPT_MAX_WORKERS = _int("SMARTCONCEPT_CONCEPT_WORKERS", 4)
+CONSOLIDATE_CONCEPTS = os.environ.get("SMARTCONCEPT_CONSOLIDATE_CONCEPTS", "1") == "1"
+
+# Background jobs (explanations, audio) shared by all sessions
+JOB_WORKERS = _int("SMARTCONCEPT_JOB_WORKERS", 4)
+# How long finished jobs stay collectable after a rerun or reconnect
+JOB_RETENTION = _int("SMARTCONCEPT_JOB_RETENTION", 3600)
+
+# Concurrency knob for chunk synthesis; 1 restores the old sequential behaviour
+TTS_MAX_WORKERS = _int("SMARTCONCEPT_TTS_WORKERS", 4)
+TTS_RETRIES = 2
+# Speech engine (see smartconcept.tts): "gtts" needs the network, "espeak" and
+# "piper" run locally. One name for every language, or e.g. "en=piper,te=espeak".
+TTS_BACKEND = os.environ.get("SMARTCONCEPT_TTS_BACKEND", "gtts")
+ESPEAK_COMMAND = os.environ.get("SMARTCONCEPT_ESPEAK_COMMAND", "espeak-ng")
+# Piper voice models by language, e.g. "en=/models/en_US-lessac-medium.onnx"
+PIPER_VOICES = os.environ.get("SMARTCONCEPT_PIPER_VOICES", "")
+# Worker processes that each keep every Piper voice loaded
+PIPER_WORKERS = _int("SMARTCONCEPT_PIPER_WORKERS", 2)
+# Default audio output (see audio.AUDIO_PROFILES) and speed baked into the file
+AUDIO_PROFILE = os.environ.get("SMARTCONCEPT_AUDIO_PROFILE", "opus")
+AUDIO_TEMPO = float(os.environ.get("SMARTCONCEPT_AUDIO_TEMPO", 1.25))
+
+APP_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+FONT_PATH = os.path.join(APP_DIR, "NotoSans-Regular.ttf")
+
+# Generated audio played back by sessions. Inside static/ the files can be
+# served by Streamlit directly (server.enableStaticServing).
+ARTIFACT_DIR = os.environ.get("SMARTCONCEPT_ARTIFACT_DIR", os.path.join(APP_DIR, "static", "artifacts"))
+ARTIFACT_MAX_BYTES = _int("SMARTCONCEPT_ARTIFACT_MAX_BYTES", 2 * 1024 * 1024 * 1024)
+ARTIFACT_SESSION_BYTES = _int("SMARTCONCEPT_ARTIFACT_SESSION_BYTES", 200 * 1024 * 1024)
+# Files unused for this long are deleted even if their session is still open
+ARTIFACT_TTL = _int("SMARTCONCEPT_ARTIFACT_TTL", 6 * 3600)
+
+# The stage metrics panel is shown when the page is opened with ?admin=<token>
+ADMIN_TOKEN = os.environ.get("SMARTCONCEPT_ADMIN_TOKEN")
@@ -0,0 +1,128 @@
+# === DOCUMENT LOADING ===
+"""Turn uploaded PDF/PPTX bytes into page texts and structural concepts."""
+
+import io
+import os
+import tempfile
+
+from smartconcept import config, resources, tracing
+from smartconcept.cache import make_key
+from smartconcept.extraction import iter_pdf_pages, iter_pptx_slides, pdf_page_count
+from smartconcept.structure import heading_concepts, pdf_outline_concepts, pdf_structure_concepts, pptx_structure_concepts
+
+
+def fingerprint(data):
+    """Content hash identifying a document regardless of its file name"""
+    return make_key(data)
+
+
+def extract_pages_from_pdf(data, on_page=None, fonts=False):
+    """Extract page texts in parallel; ``on_page(done, total)`` reports progress.
+
+    With ``fonts`` returns ``(pages, font_lines)``, the heading-font data of
+    every page being collected by the same workers.
+    """
+    # Workers open the file from disk instead of receiving the bytes
+    with tempfile.NamedTemporaryFile(suffix=".pdf", delete=False) as tmp:
+        tmp.write(data)
+    try:
+        total = pdf_page_count(tmp.name)
+        pages, font_lines = [], []
+        for page in iter_pdf_pages(tmp.name, executor=resources.get_extraction_pool(), fonts=fonts):
+            if fonts:
+                page, lines = page
+                font_lines.append(lines)
+            pages.append(page)
+            if on_page:
+                on_page(len(pages), total)
+        return (pages, font_lines) if fonts else pages
+    finally:
+        os.remove(tmp.name)
+
+
+def extract_pages_from_pptx(data, on_page=None):
+    from pptx import Presentation
+
+    prs = Presentation(io.BytesIO(data))
+    total = len(prs.slides)
+    pages = []
+    for text in iter_pptx_slides(prs):
+        pages.append(text)
+        if on_page:
+            on_page(len(pages), total)
+    return pages
+
+
+def extract_outline_from_pdf(data):
+    """Concepts from the PDF bookmarks or heading fonts, as ``(concepts, source)``"""
+    import fitz  # PyMuPDF
+
+    with fitz.open(stream=data, filetype="pdf") as doc:
+        return pdf_structure_concepts(doc)
+
+
+def extract_pdf(data, on_page=None):
+    """Pages and ``(concepts, source)`` of a PDF in one pass over its pages.
+
+    The bookmarks are read first; only when they are not enough do the
+    extraction workers also collect heading fonts, which are dropped as soon
+    as the headings have been picked out.
+    """
+    import fitz  # PyMuPDF
+
+    with tracing.span("extract.outline", format="pdf", source="outline"):
+        with fitz.open(stream=data, filetype="pdf") as doc:
+            structure = pdf_outline_concepts(doc)
+    with tracing.span("extract.pages", format="pdf"):
+        if structure[0]:
+            return extract_pages_from_pdf(data, on_page), structure
+        pages, font_lines = extract_pages_from_pdf(data, on_page, fonts=True)
+    with tracing.span("extract.outline", format="pdf", source="headings"):
+        return pages, heading_concepts(font_lines)
+
+
+def extract_outline_from_pptx(data):
+    """Concepts from the slide title placeholders, as ``(concepts, source)``"""
+    from pptx import Presentation
+
+    return pptx_structure_concepts(Presentation(io.BytesIO(data)))
+
+
+def load_document(data, name, doc_key=None, on_page=None):
+    """Extract pages and structural concepts, reusing results cached by content hash.
+
+    Pages are streamed from the extraction workers only to report progress and
+    bound memory in flight; the full list is returned because every consumer
+    needs the whole document: the extraction cache stores it as one entry,
+    ``identify_concepts`` caches and windows the joined text (windows overlap
+    across page boundaries), the retrieval index is built per document, and
+    Gemini is only called once the outline turns out to be unusable.
+    """
+    ext = name.split(".")[-1].lower()
+    with tracing.span("extract", format=ext, bytes=len(data)) as span:
+        cache = resources.get_extraction_cache()
+        cache_key = make_key("extract", config.EXTRACT_VERSION, ext, doc_key or fingerprint(data))
+        cached = cache.get(cache_key)
+        if cached is not None:
+            span.set(cache_hit=True, pages=len(cached["pages"]))
+            return cached["pages"], tuple(cached["structure"])
+
+        pages, structure = [], ([], None)
+        if ext == "pdf":
+            pages, structure = extract_pdf(data, on_page)
+        elif ext == "pptx":
+            with tracing.span("extract.pages", format=ext):
+                pages = extract_pages_from_pptx(data, on_page)
+            with tracing.span("extract.outline", format=ext):
+                structure = extract_outline_from_pptx(data)
+        span.set(cache_hit=False, pages=len(pages), structural_concepts=len(structure[0]))
+        cache.set(cache_key, {"pages": pages, "structure": list(structure)})
+        return pages, structure
+
+
+def extract_text_from_pdf(data):
+    return "\n".join(extract_pages_from_pdf(data))
+
+
+def extract_text_from_pptx(data):
+    return "\n".join(extract_pages_from_pptx(data)).strip()
@@ -0,0 +1,55 @@
+# === PDF EXPORT ===
+"""Render explanations to one PDF, memoized by the explanations' content."""
+
+import functools
+import re
+
+from smartconcept import config, tracing
+
+
+def clean_markdown(text):
+    """Strip the markdown the explanations use, for plain-text layout"""
+    cleaned = re.sub(r"\*\*(.*?)\*\*", r"\1", text)  # remove bold markdown
+    cleaned = re.sub(r"##+", "", cleaned)  # remove headings like ## Title
+    cleaned = re.sub(r"`", "", cleaned)    # remove backticks
+    cleaned = re.sub(r"\s+", " ", cleaned) # normalize spaces
+    cleaned = re.sub(r"•", "-", cleaned)   # replace bullets if needed
+    return cleaned
+
+@functools.lru_cache(maxsize=16)
+def build_explanations_pdf(explanations):
+    """Lay out every explanation in one PDF; ``explanations`` is a tuple of (concept, text) pairs.
+
+    Memoized by content, so reruns and repeated downloads of the same
+    explanations reuse the bytes. fpdf keeps the parsed font metrics in a
+    ``.pkl`` next to the font, so only the first export parses the TTF.
+    """
+    from fpdf import FPDF
+
+    with tracing.span("export.pdf", sections=len(explanations)) as span:
+        pdf = FPDF()
+        pdf.add_page()
+        pdf.set_auto_page_break(auto=True, margin=15)
+
+        # Register Unicode font (required for Telugu)
+        pdf.add_font("Noto", "", config.FONT_PATH, uni=True)
+
+        for concept, explanation in explanations:
+            # Set title in bold
+            pdf.set_font("Noto", size=14)
+            pdf.cell(0, 10, txt=concept, ln=True)
+            pdf.set_font("Noto", size=12)
+
+            # Add text to PDF
+            pdf.multi_cell(0, 8, clean_markdown(explanation) + "\n")
+
+            # Optional: Divider line
+            pdf.ln(2)
+            pdf.line(10, pdf.get_y(), 200, pdf.get_y())
+            pdf.ln(5)
+
+        # fpdf 1.x returns a latin-1 str here, fpdf2 a bytearray
+        data = pdf.output(dest="S")
+        data = data.encode("latin-1") if isinstance(data, str) else bytes(data)
+        span.set(pages=pdf.page_no(), bytes=len(data))
+        return data
@@ -0,0 +1,105 @@
+# === PAGE-PARALLEL EXTRACTION ===
+"""Streaming text extraction for large PDF and PPTX documents.
+
+PDF page ranges are farmed out to a process pool; every worker opens the file
+from disk itself, so the upload is never pickled and only a bounded number of
+page ranges are held in memory at a time. Pages are yielded in order as soon
+as they are available.
+"""
+
+import multiprocessing
+import os
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+# Below this many pages the pool start-up cost outweighs the parallelism
+MIN_PARALLEL_PAGES = 32
+DEFAULT_BATCH_PAGES = 16
+
+
+def default_workers():
+    return max(1, (os.cpu_count() or 2) - 1)
+
+
+def pdf_page_count(path):
+    import fitz  # PyMuPDF
+
+    with fitz.open(path) as doc:
+        return doc.page_count
+
+
+def _extract_pdf_range(path, start, stop, fonts=False):
+    import fitz  # PyMuPDF
+
+    from smartconcept.structure import page_font_lines
+
+    with fitz.open(path) as doc:
+        if fonts:
+            return [(doc[i].get_text(), page_font_lines(doc[i])) for i in range(start, stop)]
+        return [doc[i].get_text() for i in range(start, stop)]
+
+
+def iter_pdf_pages(path, executor=None, batch_pages=DEFAULT_BATCH_PAGES, max_in_flight=None, fonts=False):
+    """Yield the text of each page of the PDF at ``path``, in order.
+
+    When ``executor`` (a ``ProcessPoolExecutor``) is given and the document is
+    large enough, ranges of ``batch_pages`` pages are extracted in parallel with
+    at most ``max_in_flight`` ranges outstanding. With ``fonts`` each item is
+    ``(text, font_lines)`` (see ``structure.page_font_lines``), read in the
+    same pass so heading detection does not walk the document again.
+    """
+    total = pdf_page_count(path)
+    if executor is None or total < MIN_PARALLEL_PAGES:
+        for start in range(0, total, batch_pages):
+            yield from _extract_pdf_range(path, start, min(start + batch_pages, total), fonts)
+        return
+
+    max_in_flight = max_in_flight or 2 * getattr(executor, "_max_workers", default_workers())
+    ranges = iter(range(0, total, batch_pages))
+    pending = deque()
+    for start in ranges:
+        pending.append(executor.submit(_extract_pdf_range, path, start, min(start + batch_pages, total), fonts))
+        if len(pending) >= max_in_flight:
+            break
+    while pending:
+        pages = pending.popleft().result()
+        start = next(ranges, None)
+        if start is not None:
+            pending.append(executor.submit(_extract_pdf_range, path, start, min(start + batch_pages, total), fonts))
+        yield from pages
+
+
+def _shape_texts(shape):
+    """Text of a shape, descending into groups and table cells."""
+    if hasattr(shape, "shapes"):  # group shape
+        for child in shape.shapes:
+            yield from _shape_texts(child)
+        return
+    if getattr(shape, "has_table", False):
+        for row in shape.table.rows:
+            cells = [cell.text.strip() for cell in row.cells]
+            if any(cells):
+                yield " | ".join(cells)
+        return
+    if getattr(shape, "has_text_frame", False) and shape.text_frame.text.strip():
+        yield shape.text_frame.text
+
+
+def iter_pptx_slides(prs):
+    """Yield the text of each slide, including tables and grouped shapes.
+
+    python-pptx has to load the whole package to read any slide, so slides are
+    walked in-process rather than split across workers.
+    """
+    for slide in prs.slides:
+        yield "\n".join(text for shape in slide.shapes for text in _shape_texts(shape))
+
+
+def make_process_pool(workers=None, initializer=None, initargs=()):
+    # Spawn rather than fork: the host process (Streamlit) is multi-threaded
+    return ProcessPoolExecutor(
+        max_workers=workers or default_workers(),
+        mp_context=multiprocessing.get_context("spawn"),
+        initializer=initializer,
+        initargs=initargs,
+    )
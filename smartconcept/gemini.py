@@ -0,0 +1,174 @@
+# === GEMINI CLIENT ===
+"""Shared client layer around ``generate_content``.
+
+- Single-flight: identical prompts that are in flight at the same time share
+  one API call. Streaming callers replay the shared chunks as they arrive.
+- Throttling: every call waits for both the requests-per-minute and the
+  tokens-per-minute budget, so bursts queue up instead of hitting 429s.
+- Retries: rate-limit and transient server errors are retried with capped
+  exponential backoff and full jitter.
+"""
+
+import random
+import threading
+import time
+
+from smartconcept import tracing
+from smartconcept.cache import make_key
+
+# google.api_core exception class names worth retrying
+RETRYABLE_ERRORS = {
+    "ResourceExhausted", "TooManyRequests", "ServiceUnavailable", "InternalServerError",
+    "DeadlineExceeded", "GatewayTimeout", "Aborted", "Unknown",
+}
+# Rough characters-per-token ratio used to budget prompts before sending them
+CHARS_PER_TOKEN = 4
+
+
+def is_retryable(error):
+    if isinstance(error, (ConnectionError, TimeoutError)):
+        return True
+    return any(cls.__name__ in RETRYABLE_ERRORS for cls in type(error).__mro__)
+
+
+class _Flight:
+    """One API call and the chunks it has produced so far."""
+
+    def __init__(self):
+        self._cond = threading.Condition()
+        self.chunks = []
+        self.done = False
+        self.error = None
+        self.callers = 1
+
+    def append(self, chunk):
+        with self._cond:
+            self.chunks.append(chunk)
+            self._cond.notify_all()
+
+    def finish(self, error=None):
+        with self._cond:
+            self.error = error
+            self.done = True
+            self._cond.notify_all()
+
+    def __iter__(self):
+        index = 0
+        while True:
+            with self._cond:
+                while index >= len(self.chunks) and not self.done:
+                    self._cond.wait()
+                if index < len(self.chunks):
+                    chunk = self.chunks[index]
+                    index += 1
+                elif self.error is not None:
+                    raise self.error
+                else:
+                    return
+            yield chunk
+
+
+class GeminiClient:
+    """Throttled, retrying, coalescing wrapper around a Gemini model.
+
+    ``get_model`` is called for every request so the model can be swapped (e.g.
+    for the offline benchmark stand-in). ``requests`` and ``tokens`` are
+    ``TokenBucket``s for the RPM and TPM budgets; ``tokens`` may be None.
+    """
+
+    def __init__(self, get_model, requests, tokens=None, max_retries=4, backoff=1.0,
+                 max_backoff=30.0, output_tokens=1500):
+        self.get_model = get_model
+        self.requests = requests
+        self.tokens = tokens
+        self.max_retries = max_retries
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.output_tokens = output_tokens
+        self._lock = threading.Lock()
+        self._flights = {}
+
+    def generate(self, prompt):
+        """Return the full response text for ``prompt``."""
+        return "".join(self._join(prompt, stream=False))
+
+    def stream(self, prompt):
+        """Yield response text chunks for ``prompt`` as they arrive."""
+        return iter(self._join(prompt, stream=True))
+
+    def in_flight(self):
+        with self._lock:
+            return len(self._flights)
+
+    def _join(self, prompt, stream):
+        key = make_key(prompt)
+        with self._lock:
+            flight = self._flights.get(key)
+            if flight is not None:
+                flight.callers += 1
+            else:
+                flight = self._flights[key] = _Flight()
+                # The call runs on its own thread so it completes for the other
+                # callers even if the caller that started it stops reading
+                threading.Thread(
+                    target=self._run, args=(key, prompt, stream, flight), name="smartconcept-gemini", daemon=True
+                ).start()
+        return flight
+
+    def _run(self, key, prompt, stream, flight):
+        error = None
+        with tracing.span("gemini.call", prompt_chars=len(prompt), streamed=stream) as span:
+            try:
+                span.set(attempts=self._call_with_retries(prompt, stream, flight))
+            except Exception as e:
+                error = e
+                span.error = type(e).__name__
+            with self._lock:
+                del self._flights[key]
+            span.set(callers=flight.callers)
+        flight.finish(error)
+
+    def _call_with_retries(self, prompt, stream, flight):
+        estimate = len(prompt) // CHARS_PER_TOKEN + self.output_tokens
+        for attempt in range(self.max_retries + 1):
+            acquired = self._throttle(estimate)
+            try:
+                used = self._call(prompt, stream, flight)
+            except Exception as e:
+                # Once chunks were handed out a retry would duplicate them
+                if flight.chunks or attempt == self.max_retries or not is_retryable(e):
+                    raise
+                delay = min(self.max_backoff, self.backoff * 2 ** attempt)
+                time.sleep(random.uniform(0, delay))
+                continue
+            if self.tokens is not None and used:
+                self.tokens.adjust(used - acquired)
+            return attempt + 1
+
+    def _throttle(self, estimate):
+        """Wait for one request and ``estimate`` tokens; returns the tokens taken."""
+        self.requests.acquire()
+        if self.tokens is None:
+            return 0
+        # A prompt larger than the bucket can only ever take a full bucket
+        acquired = min(estimate, self.tokens.capacity)
+        self.tokens.acquire(acquired)
+        return acquired
+
+    def _call(self, prompt, stream, flight):
+        """Make one API call, feeding ``flight``; returns the tokens used if reported."""
+        model = self.get_model()
+        if not stream:
+            response = model.generate_content(prompt)
+            flight.append(response.text)
+            return _total_tokens(response)
+        used = None
+        for chunk in model.generate_content(prompt, stream=True):
+            flight.append(chunk.text)
+            used = _total_tokens(chunk) or used
+        return used
+
+
+def _total_tokens(response):
+    usage = getattr(response, "usage_metadata", None)
+    return getattr(usage, "total_token_count", None) or None
@@ -0,0 +1,213 @@
+# === BACKGROUND JOBS ===
+"""Process-wide queue for slow work (explanations, audio) with status and cancellation.
+
+The UI submits a job and returns immediately; the job runs on a worker thread
+and later reruns poll it by id. Identical jobs (same ``key``) are merged while
+pending, running or finished, so a refresh or a second user asking for the
+same thing attaches to the existing job instead of starting another one.
+Callers waiting on a job ``attach()`` to it; ``detach()`` cancels the job
+only once nobody is waiting for it any more.
+
+Job functions receive the ``Job`` as their first argument and use it to report
+progress and to notice cancellation::
+
+    def work(job, text):
+        job.set_progress(0.5, "halfway")
+        job.check_cancelled()      # raises JobCancelled once cancel() was called
+        return result
+
+Problems the job body reports through ``smartconcept.reporting`` are kept in
+``job.warnings`` for the UI to show.
+"""
+
+import collections
+import itertools
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from smartconcept import reporting, tracing
+
+PENDING = "pending"
+RUNNING = "running"
+DONE = "done"
+FAILED = "failed"
+CANCELLED = "cancelled"
+ACTIVE = (PENDING, RUNNING)
+FINISHED = (DONE, FAILED, CANCELLED)
+
+
+class JobCancelled(Exception):
+    pass
+
+
+class Job:
+    """One unit of background work and everything the UI needs to show it."""
+
+    def __init__(self, job_id, kind, key, group=None, label=None):
+        self.id = job_id
+        self.kind = kind
+        self.key = key
+        self.group = group
+        self.label = label or kind
+        self.status = PENDING
+        self.progress = 0.0
+        self.message = ""
+        self.partial = None
+        self.result = None
+        self.error = None
+        self.warnings = []
+        self.created = time.time()
+        self.started = None
+        self.finished = None
+        # Sessions waiting for the result (see JobQueue.attach/detach)
+        self.watchers = 0
+        self._cancel = threading.Event()
+        self._future = None
+
+    @property
+    def active(self):
+        return self.status in ACTIVE
+
+    @property
+    def cancel_requested(self):
+        return self._cancel.is_set()
+
+    def set_progress(self, progress, message=None):
+        self.progress = max(0.0, min(1.0, progress))
+        if message is not None:
+            self.message = message
+
+    def set_partial(self, partial):
+        """Publish an intermediate result, e.g. the text streamed so far."""
+        self.check_cancelled()
+        self.partial = partial
+
+    def warn(self, message):
+        self.warnings.append(message)
+
+    def check_cancelled(self):
+        if self._cancel.is_set():
+            raise JobCancelled(self.id)
+
+    def wait(self, timeout=None):
+        """Block until the job has finished; returns its status."""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while self.active:
+            if deadline is not None and time.monotonic() >= deadline:
+                break
+            time.sleep(0.05)
+        return self.status
+
+
+class JobQueue:
+    """Thread pool plus a registry of jobs, shared by every session in the process.
+
+    Finished jobs are kept for ``retention`` seconds (and at most ``max_jobs``
+    in total) so that reruns and reconnecting sessions can still collect them.
+    """
+
+    def __init__(self, max_workers=4, retention=3600, max_jobs=1000):
+        self.retention = retention
+        self.max_jobs = max_jobs
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="smartconcept-job")
+        self._lock = threading.Lock()
+        self._jobs = collections.OrderedDict()
+        self._by_key = {}
+        self._ids = itertools.count(1)
+
+    def submit(self, kind, key, func, *args, group=None, label=None, **kwargs):
+        """Queue ``func(job, *args, **kwargs)`` unless a job with ``key`` exists.
+
+        Returns the new job, or the existing one for ``key`` when it is still
+        pending/running or has finished successfully.
+        """
+        with self._lock:
+            self._prune()
+            existing = self._jobs.get(self._by_key.get(key))
+            if existing is not None and existing.status in ACTIVE + (DONE,):
+                return existing
+            job = Job(f"{kind}-{next(self._ids)}", kind, key, group=group, label=label)
+            self._jobs[job.id] = job
+            self._by_key[key] = job.id
+            job._future = self._executor.submit(self._run, job, func, args, kwargs)
+        return job
+
+    def _run(self, job, func, args, kwargs):
+        if job.cancel_requested:
+            self._finish(job, CANCELLED)
+            return
+        job.started = time.time()
+        job.status = RUNNING
+        with tracing.span(f"job.{job.kind}", queue_wait_s=job.started - job.created) as span, \
+                reporting.redirect(error=job.warn, warning=job.warn):
+            try:
+                job.result = func(job, *args, **kwargs)
+            except JobCancelled:
+                span.set(cancelled=True)
+                self._finish(job, CANCELLED)
+            except Exception as e:
+                job.error = f"{type(e).__name__}: {e}"
+                span.error = type(e).__name__
+                self._finish(job, FAILED)
+            else:
+                job.set_progress(1.0)
+                self._finish(job, DONE)
+
+    def _finish(self, job, status):
+        job.finished = time.time()
+        job.status = status
+
+    def get(self, job_id):
+        with self._lock:
+            return self._jobs.get(job_id)
+
+    def list(self, group=None, statuses=None):
+        with self._lock:
+            self._prune()
+            return [
+                job for job in self._jobs.values()
+                if (group is None or job.group == group) and (statuses is None or job.status in statuses)
+            ]
+
+    def attach(self, job_id):
+        """Record one more caller waiting for ``job_id``."""
+        with self._lock:
+            job = self._jobs.get(job_id)
+            if job is not None:
+                job.watchers += 1
+        return job
+
+    def detach(self, job_id):
+        """Stop waiting for a job; it is cancelled once nobody is waiting. Returns True if cancelled."""
+        with self._lock:
+            job = self._jobs.get(job_id)
+            if job is None:
+                return False
+            job.watchers = max(0, job.watchers - 1)
+            if job.watchers:
+                return False
+        return self.cancel(job_id)
+
+    def cancel(self, job_id):
+        """Cancel a job; pending jobs stop at once, running ones at their next check."""
+        job = self.get(job_id)
+        if job is None or not job.active:
+            return False
+        job._cancel.set()
+        if job._future is not None and job._future.cancel():
+            self._finish(job, CANCELLED)
+        return True
+
+    def _prune(self):
+        """Forget finished jobs past retention, oldest first. Caller holds the lock."""
+        cutoff = time.time() - self.retention
+        finished = [job for job in self._jobs.values() if not job.active]
+        excess = len(self._jobs) - self.max_jobs
+        for job in finished:
+            if job.finished >= cutoff and excess <= 0:
+                break
+            del self._jobs[job.id]
+            if self._by_key.get(job.key) == job.id:
+                del self._by_key[job.key]
+            excess -= 1
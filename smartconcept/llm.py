@@ -0,0 +1,445 @@
+# === GEMINI PIPELINE ===
+"""Concept identification and explanation with Gemini."""
+
+import json
+import time
+
+from smartconcept import audio, config, reporting, resources, tracing
+from smartconcept.batch import run_batch
+from smartconcept.cache import make_key
+from smartconcept.concepts import concept_signature, merge_concepts, parse_concept_list, split_windows
+
+
+def extract_window_concepts(window):
+    """Ask Gemini for the concepts found in a single window of text"""
+    prompt = f"""
+You are a highly accurate document parser. Analyze the following academic content and extract only meaningful, high-level topics and subtopics.
+
+STRICT INSTRUCTIONS:
+- Only extract headings, chapter names, or subheadings — not formulas, not examples.
+- Avoid garbage like short codes (e.g., TP, OM) or numeric-only lines.
+- Do not return duplicates or repeated wording (e.g., "Permutation" and "Permutations").
+- Do not include the chapter summary or index blocks (like Unit III...).
+- Preserve the logical order from the text.
+
+Return only a clean numbered list of the concepts found in the below text:
+
+{window[:config.CONCEPT_WINDOW_CHARS]}
+
+FORMAT STRICTLY LIKE THIS:
+1. Topic One
+2. Topic Two
+3. ...
+"""
+    with tracing.span("llm.identify_window", prompt_chars=len(prompt)) as span:
+        text = resources.get_gemini_client().generate(prompt)
+        span.set(response_chars=len(text))
+    return parse_concept_list(text)
+
+def consolidate_concepts(concepts):
+    """Single reduce call that cleans up the merged per-window candidates"""
+    numbered = "\n".join(f"{i}. {c}" for i, c in enumerate(concepts, start=1))
+    prompt = f"""
+The following topics were extracted from consecutive parts of one academic document, in document order.
+
+STRICT INSTRUCTIONS:
+- Remove duplicates and near-duplicates (e.g., "Permutation" and "Permutations"), keeping the first one.
+- Remove garbage entries such as short codes, numeric-only lines, summaries or index blocks.
+- Do not add new topics and do not rename topics.
+- Preserve the given order.
+
+{numbered}
+
+FORMAT STRICTLY LIKE THIS:
+1. Topic One
+2. Topic Two
+3. ...
+"""
+    with tracing.span("llm.consolidate", prompt_chars=len(prompt), concepts=len(concepts)) as span:
+        text = resources.get_gemini_client().generate(prompt)
+        span.set(response_chars=len(text))
+    return parse_concept_list(text)
+
+def identify_concepts(text):
+    """
+    Smart concept extractor that identifies main topics and subtopics from any type of academic PDF.
+    Works across math, science, and general texts.
+
+    Long documents are split into windows that are analysed in parallel; the
+    candidates are merged locally in document order and optionally consolidated
+    with one final call.
+    """
+    with tracing.span("identify_concepts", text_chars=len(text)) as span:
+        cache = resources.get_llm_cache()
+        cache_key = make_key(
+            "concepts", config.IDENTIFY_PROMPT_VERSION,
+            config.CONCEPT_WINDOW_CHARS, config.CONSOLIDATE_CONCEPTS, text,
+        )
+        cached = cache.get(cache_key)
+        if cached is not None:
+            span.set(cache_hit=True, concepts=len(cached))
+            return cached
+
+        span.set(cache_hit=False)
+        try:
+            windows = split_windows(text, config.CONCEPT_WINDOW_CHARS, config.CONCEPT_WINDOW_OVERLAP)
+            span.set(windows=len(windows))
+            if len(windows) == 1:
+                clean = extract_window_concepts(windows[0])
+            else:
+                results = run_batch(
+                    windows,
+                    extract_window_concepts,
+                    max_workers=config.CONCEPT_MAX_WORKERS,
+                )
+                failed = [error for _, _, error in results if error is not None]
+                if len(failed) == len(results):
+                    raise failed[0]
+                if failed:
+                    reporting.warning(f"⚠️ {len(failed)} of {len(results)} document sections could not be analysed.")
+                clean = merge_concepts(result for _, result, error in results if error is None)
+                if config.CONSOLIDATE_CONCEPTS and clean:
+                    try:
+                        consolidated = consolidate_concepts(clean)
+                        # Never let the reduce step invent topics or wipe the list
+                        allowed = {concept_signature(c) for c in clean}
+                        consolidated = [c for c in consolidated if concept_signature(c) in allowed]
+                        if consolidated:
+                            clean = consolidated
+                    except Exception as e:
+                        reporting.warning(f"⚠️ Concept consolidation skipped: {e}")
+
+            span.set(concepts=len(clean))
+            if clean:
+                cache.set(cache_key, clean)
+            return clean
+
+        except Exception as e:
+            span.error = type(e).__name__
+            reporting.error(f"❌ Gemini extraction error: {e}")
+            return []
+
+
+# === EXPLANATION PROMPTS ===
+# How each language is asked for, and the answer structure it must follow
+EXPLAIN_STYLES = {
+    "Telugu": (
+        "in a **simple, clear and student-friendly** manner using **Telugu + English mix** style",
+        """
+Your explanation must follow this structure:
+
+1. **Definition**  
+   - Concept ni Telugu lo simple ga explain cheyyandi  
+   - Important terminology English lo cheppandi (e.g., Mean అంటే Average)  
+   - Example tho clarity ivvandi
+
+2. **Key Characteristics**  
+   - 5-6 important features cheppandi  
+   - Each point simple sentence lo cheppandi  
+   - Keywords English lo use cheyyandi
+
+3. **Real-life Examples**  
+   - PDF lo unna examples  
+   - Mee side examples (3 total)  
+   - Telugu explanation + English terms
+
+4.  **Problems/Applications**  
+   - Step-by-step ga problem solve cheyyandi  
+   - English lo formula explain cheyyandi, Telugu lo steps explain cheyyandi  
+   - Answer final ga cheppandi
+
+5.  **Importance/Uses**  
+   - Concept use enti, ela practical ga help chesthundi  
+   - English terms explain cheyyandi (e.g., data analysis, decision making)
+
+6.  **Common Mistakes**  
+   - Students cheyyedhi common mistakes enti  
+   - Examples tho explain cheyyandi
+
+🧠 Style:
+- Use **spoken conversational Telugu + English mix**
+- Very simple language
+- Highlight important English terms
+- No lengthy or complex sentences
+- Make it feel like a teacher is explaining to a student in class
+
+""",
+    ),
+    "English": (
+        "in clear and detailed English",
+        """
+Follow this structure:
+1.  Definition
+2.  Key Characteristics
+3.  Real-life Examples
+4.  Problems/Applications
+5.  Importance/Uses
+6.  Common Mistakes
+
+- Use friendly and simple teaching style
+- Each section should have at least 8–10 lines
+- Include formulae, diagrams, and examples if found in PDF
+
+""",
+    ),
+}
+
+def explain_prompt(concept, context, lang):
+    style, guide = EXPLAIN_STYLES["Telugu" if lang == "Telugu" else "English"]
+    return f"""
+Explain the topic '{concept}' from the given PDF {style}.
+{guide}Context:  
+{context[:10000]}
+        """
+
+def explain_batch_prompt(concepts, context, lang):
+    """One prompt explaining all ``concepts``, answered as JSON keyed by concept"""
+    style, guide = EXPLAIN_STYLES["Telugu" if lang == "Telugu" else "English"]
+    topics = "\n".join(f"- {concept}" for concept in concepts)
+    keys = json.dumps({concept: "..." for concept in concepts}, ensure_ascii=False, indent=2)
+    return f"""
+Explain each of the following topics from the given PDF {style}.
+
+Topics:
+{topics}
+
+Write a complete, separate explanation for every topic.
+{guide}OUTPUT FORMAT:
+Return ONLY a JSON object with exactly these keys, each mapped to the full
+explanation of that topic as one Markdown string. No text outside the JSON.
+{keys}
+
+Context:  
+{context[:10000]}
+        """
+
+
+# === EXPLAIN CONCEPT ===
+def explain_concept(concept, context, lang, on_chunk=None, metrics=None, strict=False):
+    """Explain ``concept`` using Gemini.
+
+    When ``on_chunk`` is given the response is streamed and ``on_chunk`` is called
+    with the accumulated text after every received chunk. If a ``metrics`` dict is
+    passed it is filled with time-to-first-token and total latency in seconds.
+    Failures are reported and returned as an error text, or raised when ``strict``.
+    """
+    metrics = {} if metrics is None else metrics
+    with tracing.span("explain_concept", context_chars=len(context), lang=lang) as span:
+        explanation = _explain_concept(concept, context, lang, on_chunk, metrics, strict)
+        span.set(cache_hit=metrics.get("cached", False), response_chars=len(explanation))
+    return explanation
+
+def _explain_concept(concept, context, lang, on_chunk, metrics, strict):
+    started = time.perf_counter()
+    cache = resources.get_llm_cache()
+    cache_key = make_key("explain", config.EXPLAIN_PROMPT_VERSION, context, concept, lang)
+    cached = cache.get(cache_key)
+    if cached is not None:
+        if on_chunk:
+            on_chunk(cached)
+        elapsed = time.perf_counter() - started
+        metrics.update(ttft=elapsed, total=elapsed, cached=True, streamed=False)
+        return cached
+
+    prompt = explain_prompt(concept, context, lang)
+
+    try:
+        first_token = None
+        client = resources.get_gemini_client()
+        with tracing.span("llm.explain", prompt_chars=len(prompt), streamed=bool(on_chunk)) as span:
+            if on_chunk:
+                parts = []
+                for text in client.stream(prompt):
+                    if first_token is None:
+                        first_token = time.perf_counter() - started
+                    parts.append(text)
+                    on_chunk("".join(parts))
+                explanation = "".join(parts).strip()
+            else:
+                explanation = client.generate(prompt).strip()
+            span.set(response_chars=len(explanation))
+        total = time.perf_counter() - started
+        metrics.update(
+            ttft=first_token if first_token is not None else total,
+            total=total,
+            cached=False,
+            streamed=bool(on_chunk),
+        )
+        cache.set(cache_key, explanation)
+        return explanation
+    except Exception as e:
+        if strict:
+            raise
+        reporting.error(f"Explanation generation failed: {str(e)}")
+        return f"Error generating explanation. Please try again. {str(e)}"
+
+
+# === BATCHED EXPLANATIONS ===
+def parse_explanation_batch(response_text, concepts):
+    """Explanations keyed by concept from a batched JSON response.
+
+    Keys are matched exactly or by ``concept_signature``. Entries that are
+    missing, empty or not strings are left out so the caller can retry them.
+    """
+    start, end = response_text.find("{"), response_text.rfind("}")
+    if start == -1 or end < start:
+        return {}
+    try:
+        data = json.loads(response_text[start:end + 1])
+    except ValueError:
+        return {}
+    if not isinstance(data, dict):
+        return {}
+    by_signature = {concept_signature(concept): concept for concept in concepts}
+    explanations = {}
+    for key, value in data.items():
+        concept = key if key in concepts else by_signature.get(concept_signature(str(key)))
+        if concept and concept not in explanations and isinstance(value, str) and value.strip():
+            explanations[concept] = value.strip()
+    return explanations
+
+def explain_concepts(concepts, context, lang, strict=False):
+    """Explain several concepts with one Gemini request that sends ``context`` once.
+
+    Concepts the JSON response misses (or all of them, if it does not parse)
+    fall back to one ``explain_concept`` call each. Returns ``{concept:
+    explanation}`` in input order; failed concepts get an error text, or are
+    left out when ``strict``.
+    """
+    cache = resources.get_llm_cache()
+    # Same key as explain_concept, so batched and single results are interchangeable
+    keys = {c: make_key("explain", config.EXPLAIN_PROMPT_VERSION, context, c, lang) for c in concepts}
+    explanations = {}
+    for concept in concepts:
+        cached = cache.get(keys[concept])
+        if cached is not None:
+            explanations[concept] = cached
+    pending = [c for c in concepts if c not in explanations]
+
+    with tracing.span("explain_concepts", concepts=len(concepts), cached=len(concepts) - len(pending)) as span:
+        if len(pending) > 1:
+            prompt = explain_batch_prompt(pending, context, lang)
+            try:
+                with tracing.span("llm.explain_batch", prompt_chars=len(prompt), concepts=len(pending)) as call:
+                    text = resources.get_gemini_client().generate(prompt)
+                    parsed = parse_explanation_batch(text, pending)
+                    call.set(response_chars=len(text), parsed=len(parsed))
+            except Exception as e:
+                reporting.logger.warning("Batched explanation failed, explaining one by one: %s", e)
+                parsed = {}
+            for concept, explanation in parsed.items():
+                cache.set(keys[concept], explanation)
+                explanations[concept] = explanation
+            pending = [c for c in pending if c not in parsed]
+
+        span.set(fallbacks=len(pending))
+        results = run_batch(
+            pending,
+            lambda concept: explain_concept(concept, context, lang, strict=strict),
+            max_workers=config.BATCH_MAX_WORKERS,
+        )
+        for concept, explanation, error in results:
+            if error is None:
+                explanations[concept] = explanation
+    return {c: explanations[c] for c in concepts if c in explanations}
+
+
+# === BACKGROUND JOBS ===
+def explain_job(job, concept, context, lang, with_audio=False, stream=True, profile=None, tempo=None):
+    """Job body for ``JobQueue``: explain ``concept`` and optionally voice it.
+
+    ``profile`` and ``tempo`` are passed on to ``generate_high_quality_audio``.
+
+    With ``stream`` the text received so far is published as ``job.partial``
+    so pollers can show it while it arrives, and cancellation is honoured
+    between chunks.
+    """
+    job.set_progress(0.05, "Waiting for Gemini")
+    metrics = {}
+    explanation = explain_concept(
+        concept, context, lang, on_chunk=job.set_partial if stream else None, metrics=metrics, strict=True
+    )
+    job.check_cancelled()
+    result = {"concept": concept, "lang": lang, "explanation": explanation, "metrics": metrics, "audio": None}
+    if with_audio:
+        job.set_progress(0.6, "Generating audio")
+        result["audio"] = audio.generate_high_quality_audio(explanation, lang, profile=profile, tempo=tempo)
+    return result
+
+def explain_batch_job(job, concepts, context, lang, with_audio=False, profile=None, tempo=None):
+    """Job body for a batch of concepts explained by ``explain_concepts``."""
+    job.set_progress(0.05, f"Waiting for Gemini ({len(concepts)} concepts)")
+    explanations = explain_concepts(concepts, context, lang, strict=True)
+    job.check_cancelled()
+    missing = [c for c in concepts if c not in explanations]
+    if not explanations:
+        raise RuntimeError(f"no explanation returned for {', '.join(missing)}")
+    result = {"concepts": concepts, "lang": lang, "explanations": explanations, "missing": missing, "audio": {}}
+    if with_audio:
+        for done, (concept, explanation) in enumerate(explanations.items()):
+            job.set_progress(0.5 + 0.5 * done / len(explanations), f"Generating audio: {concept}")
+            job.check_cancelled()
+            result["audio"][concept] = audio.generate_high_quality_audio(
+                explanation, lang, profile=profile, tempo=tempo
+            )
+    return result
+
+
+# === BATCH EXPLANATION ===
+def explain_all_concepts(concepts, context_for, lang, with_audio=False, max_workers=None,
+                         on_progress=None, strict=False, batch_size=1,
+                         profile=None, tempo=None):
+    """Explain (and optionally voice) every concept concurrently.
+
+    ``context_for(concept)`` returns the document context to send for a concept.
+    Gemini calls are throttled by the shared rate limiter, so ``max_workers`` only
+    bounds how many concepts are in flight at once. With ``strict`` a failed
+    explanation is returned as the item's error instead of an error text.
+
+    With ``batch_size`` > 1 concepts are explained that many per request via
+    ``explain_concepts``, with ``context_for`` given the batch's concepts joined
+    by spaces. Results and progress are still reported per concept.
+
+    ``profile`` and ``tempo`` select the audio format and speed.
+    """
+    def voice(text):
+        if not with_audio:
+            return None
+        return audio.generate_high_quality_audio(text, lang, profile=profile, tempo=tempo)
+
+    def process(concept):
+        explanation = explain_concept(concept, context_for(concept), lang, strict=strict)
+        return explanation, voice(explanation)
+
+    max_workers = max_workers or config.BATCH_MAX_WORKERS
+    if batch_size <= 1:
+        return run_batch(
+            concepts,
+            process,
+            max_workers=max_workers,
+            on_progress=on_progress,
+        )
+
+    def process_batch(batch):
+        explanations = explain_concepts(batch, context_for(" ".join(batch)), lang, strict=strict)
+        return {
+            concept: (text, voice(text))
+            for concept, text in explanations.items()
+        }
+
+    concepts = list(concepts)
+    results = {}
+
+    def expand(done, total, batch, explained, error):
+        for concept in batch:
+            if error is None and concept not in explained:
+                item_error = RuntimeError(f"no explanation returned for {concept}")
+            else:
+                item_error = error
+            results[concept] = (concept, None if item_error else explained[concept], item_error)
+            if on_progress:
+                on_progress(len(results), len(concepts), *results[concept])
+
+    batches = [concepts[i:i + batch_size] for i in range(0, len(concepts), batch_size)]
+    run_batch(batches, process_batch, max_workers=max_workers, on_progress=expand)
+    return [results[concept] for concept in concepts]
@@ -0,0 +1,133 @@
+# === MP3 FRAME UTILITIES ===
+"""Join MP3 streams at the frame level, without decoding or re-encoding.
+
+gTTS returns MPEG Layer III audio with identical parameters for every chunk,
+so chunks can be stitched together by concatenating their frames. Pauses are
+built from silent frames that copy the header of the real audio.
+"""
+
+# Bitrates in kbps indexed by [version is MPEG-1][bitrate index] for Layer III
+_BITRATES = {
+    True: [0, 32, 40, 48, 56, 64, 80, 96, 112, 128, 160, 192, 224, 256, 320],
+    False: [0, 8, 16, 24, 32, 40, 48, 56, 64, 80, 96, 112, 128, 144, 160],
+}
+_SAMPLE_RATES = {
+    3: [44100, 48000, 32000],  # MPEG-1
+    2: [22050, 24000, 16000],  # MPEG-2
+    0: [11025, 12000, 8000],   # MPEG-2.5
+}
+
+
+class FrameHeader:
+    __slots__ = ("raw", "version", "bitrate", "sample_rate", "channels", "length")
+
+    def __init__(self, raw, version, bitrate, sample_rate, channels, length):
+        self.raw = raw
+        self.version = version
+        self.bitrate = bitrate
+        self.sample_rate = sample_rate
+        self.channels = channels
+        self.length = length
+
+    @property
+    def format(self):
+        return (self.version, self.sample_rate, self.channels)
+
+    @property
+    def samples(self):
+        return 1152 if self.version == 3 else 576
+
+    @property
+    def side_info_size(self):
+        if self.version == 3:
+            return 17 if self.channels == 1 else 32
+        return 9 if self.channels == 1 else 17
+
+
+def parse_header(data, offset):
+    """Parse the Layer III frame header at ``offset``; None if there is no valid frame."""
+    if offset + 4 > len(data):
+        return None
+    b0, b1, b2, b3 = data[offset:offset + 4]
+    if b0 != 0xFF or (b1 & 0xE0) != 0xE0:
+        return None
+    version = (b1 >> 3) & 0x3
+    layer = (b1 >> 1) & 0x3
+    bitrate_index = (b2 >> 4) & 0xF
+    rate_index = (b2 >> 2) & 0x3
+    if version == 1 or layer != 1 or bitrate_index in (0, 15) or rate_index == 3:
+        return None
+    bitrate = _BITRATES[version == 3][bitrate_index] * 1000
+    sample_rate = _SAMPLE_RATES[version][rate_index]
+    padding = (b2 >> 1) & 0x1
+    channels = 1 if (b3 >> 6) == 3 else 2
+    coefficient = 144 if version == 3 else 72
+    length = coefficient * bitrate // sample_rate + padding
+    return FrameHeader(bytes(data[offset:offset + 4]), version, bitrate, sample_rate, channels, length)
+
+
+def _audio_start(data):
+    """Offset of the first byte after any leading ID3v2 tag."""
+    if data[:3] == b"ID3" and len(data) >= 10:
+        size = 0
+        for byte in data[6:10]:
+            size = (size << 7) | (byte & 0x7F)
+        footer = 10 if data[5] & 0x10 else 0
+        return 10 + size + footer
+    return 0
+
+
+def iter_frames(data):
+    """Yield ``(header, frame_bytes)`` for every audio frame, skipping tags and junk."""
+    offset = _audio_start(data)
+    end = len(data) - 128 if data[-128:-125] == b"TAG" else len(data)
+    first = True
+    while offset < end:
+        header = parse_header(data, offset)
+        if header is None or offset + header.length > end:
+            offset += 1
+            continue
+        frame = data[offset:offset + header.length]
+        offset += header.length
+        if first:
+            first = False
+            # A Xing/Info/VBRI frame only carries metadata for the original stream
+            probe = frame[4 + header.side_info_size:4 + header.side_info_size + 4]
+            if probe in (b"Xing", b"Info") or frame[36:40] == b"VBRI":
+                continue
+        yield header, frame
+
+
+def silent_frames(header, duration_ms):
+    """Silent frames matching ``header``, covering roughly ``duration_ms``."""
+    # Clear the padding bit so every frame has the same nominal length
+    raw = bytes([header.raw[0], header.raw[1] | 0x01, header.raw[2] & ~0x02 & 0xFF, header.raw[3]])
+    template = parse_header(raw, 0)
+    frame = raw + bytes(template.length - 4)
+    count = max(1, round(duration_ms / 1000 * template.sample_rate / template.samples))
+    return frame * count
+
+
+def join_mp3(parts, pause_ms=0):
+    """Concatenate MP3 byte strings with ``pause_ms`` of silence between them.
+
+    Returns None when the parts do not share one sample rate/channel layout, in
+    which case the caller has to decode and re-encode instead.
+    """
+    out = []
+    audio_format = None
+    silence = b""
+    for index, data in enumerate(parts):
+        frames = list(iter_frames(data))
+        if not frames:
+            return None
+        if audio_format is None:
+            audio_format = frames[0][0].format
+            if pause_ms:
+                silence = silent_frames(frames[0][0], pause_ms)
+        if any(header.format != audio_format for header, _ in frames):
+            return None
+        if index and silence:
+            out.append(silence)
+        out.extend(frame for _, frame in frames)
+    return b"".join(out) if out else None
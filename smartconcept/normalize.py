@@ -0,0 +1,163 @@
+# === TEXT NORMALIZATION FOR TTS ===
+"""Single-pass, table-driven text normalization.
+
+Each language's rule table is compiled once into one alternation regex. At
+every position the regex rules are tried first, in table order, then the
+literal replacements, longest first. The whole text is rewritten in one
+left-to-right pass, and replacement output is never re-scanned. A short
+list of ``post`` regexes (whitespace tidy-up and the like) runs afterwards,
+each also in a single pass.
+"""
+
+import re
+
+
+class Normalizer:
+    def __init__(self, replacements=None, patterns=(), post=()):
+        """
+        replacements: mapping of literal text to its replacement
+        patterns: ``(regex, replacement)`` pairs; replacement may be a template
+            string or a callable taking the match
+        post: ``(regex, replacement)`` pairs applied in order after the main pass
+        """
+        self.replacements = dict(replacements or {})
+        self._patterns = [(re.compile(regex), repl) for regex, repl in patterns]
+        # Literals form one flat alternation, longest first, with the single
+        # characters folded into a trailing character class. Unnamed, this
+        # lets the regex engine skip quickly over text that matches nothing.
+        literals = sorted((k for k in self.replacements if len(k) > 1), key=len, reverse=True)
+        branches = [re.escape(k) for k in literals]
+        chars = [k for k in self.replacements if len(k) == 1]
+        if chars:
+            branches.append("[" + "".join(map(re.escape, chars)) + "]")
+        # Rules are named groups; a match without one is a literal
+        alternatives = [f"(?P<p{i}>{regex})" for i, (regex, _) in enumerate(patterns)] + branches
+        self._regex = re.compile("|".join(alternatives)) if alternatives else None
+        self._post = [(re.compile(regex), repl) for regex, repl in post]
+
+    def _replace(self, match):
+        name = match.lastgroup
+        if name is None:
+            return self.replacements[match.group()]
+        pattern, repl = self._patterns[int(name[1:])]
+        # Re-run the rule at the same position so its own groups are available
+        sub_match = pattern.match(match.string, match.start())
+        return repl(sub_match) if callable(repl) else sub_match.expand(repl)
+
+    def __call__(self, text):
+        if self._regex is not None:
+            text = self._regex.sub(self._replace, text)
+        for regex, repl in self._post:
+            text = regex.sub(repl, text)
+        return text.strip()
+
+
+_NORMALIZERS = {}
+
+
+def register(name, normalizer):
+    """Register a compiled normalizer under ``name`` (e.g. a TTS language code)."""
+    _NORMALIZERS[name] = normalizer
+    return normalizer
+
+
+def normalize(text, name):
+    return _NORMALIZERS[name](text)
+
+
+def _spaced_digits(number):
+    return " ".join(number)
+
+
+# Shared markdown clean-up for TTS input
+_MARKDOWN_RULES = {
+    "*": "",        # Remove asterisks
+    "#": "",        # Remove markdown headers
+    "_": "",        # Remove underscores
+    "\n": ". ",
+    "\t": " ",
+}
+
+register("tts-te", Normalizer(
+    {
+        "ఉదా.": "ఉదాహరణకు",
+        "అంటే": "అంటే ",
+        "అనగా": "అనగా ",
+        "(": ", ",
+        ")": ", ",
+        "[": ", ",
+        "]": ", ",
+        "{": ", ",
+        "}": ", ",
+        "•": "",
+        "!": "ఫ్యాక్టోరియల్",
+        "x": "ఇన్టూ",
+        "=": " ఈక్వల్టూ ",
+        "+": " ప్లస్ ",
+        "-": " మైనస్ ",
+        "/": " డివైడెడ్బై ",
+        "∩": "ఇంటర్సెక్షన్",
+        "∪": "యూనియన్",
+        "÷": "డివైడెడ్బై",
+        "Σ": "సమ్మషన్",
+        "^": " పవర్ ",
+        "%": " పర్సెంట్ ",
+        "°C": " డిగ్రీల సెల్సియస్ ",
+        "Dr.": "డాక్టర్ ",
+        "Mr.": "మిస్టర్ ",
+        "No.": "నంబర్ ",
+        "e.g.": "ఉదాహరణకు ",
+        "i.e.": "అంటే ",
+        "Fig.": "ఫిగర్ ",
+        "Eq.": "సమీకరణం ",
+        "Ch.": "అధ్యాయం ",
+        **_MARKDOWN_RULES,
+    },
+    post=[
+        (r"(\d+)\.", r"\n\n\1."),  # Add pauses between sections
+        (r" {2,}", " "),
+    ],
+))
+
+register("tts-en", Normalizer(
+    {
+        "e.g.": "for example",
+        "i.e.": "that is",
+        "Fig.": "Figure",
+        "Eq.": "Equation",
+        "Ch.": "Chapter",
+        **_MARKDOWN_RULES,
+    },
+    post=[(r" {2,}", " ")],
+))
+
+register("voice", Normalizer(
+    {"#": "", "*": "", ">": "", "\\": "", "-": ""},
+    # Removed characters between line breaks must not split a run of newlines
+    [(r"\n(?:[#*>\\\-]*\n)*", ". "), (r"[^\S\n]+", " ")],
+    post=[(r" {2,}", " ")],
+))
+
+_TELUGU_OPERATORS = {
+    "+": "ప్లస్",
+    "x": "మల్టీప్లైడ్",
+    "×": "మల్టీప్లైడ్",
+    "/": "డివైడెడ్ బై",
+    "÷": "డివైడెడ్ బై",
+    "^": "పవర్ ఆఫ్",
+    "!": "ఫ్యాక్టోరియల్",
+}
+
+# Applied after "voice" for Telugu output
+register("voice-te", Normalizer(
+    {"=": " సమానం ", "<": " తక్కువ"},
+    [
+        # Lookahead so chained operations ("1+2x3") are all spelled out
+        (r"(\d+)([+x×/÷^!])(?=\d)",
+         lambda m: f"{m.group(1)} {_TELUGU_OPERATORS[m.group(2)]} "),
+    ],
+    post=[
+        (r"\d+", lambda m: _spaced_digits(m.group())),
+        (r" {2,}", " "),
+    ],
+))
@@ -0,0 +1,47 @@
+# === USER-FACING REPORTING ===
+"""Where pipeline code reports problems the user should see.
+
+The Streamlit app routes these to ``st.error``/``st.warning``; everywhere else
+(batch tools, benchmarks) they go to the ``smartconcept`` logger. Background
+jobs have no page to write to, so their threads ``redirect()`` reports into
+the job instead.
+"""
+
+import contextlib
+import logging
+import threading
+
+logger = logging.getLogger("smartconcept")
+
+_handlers = {"error": logger.error, "warning": logger.warning}
+_local = threading.local()
+
+
+def set_handlers(error=None, warning=None):
+    if error is not None:
+        _handlers["error"] = error
+    if warning is not None:
+        _handlers["warning"] = warning
+
+
+@contextlib.contextmanager
+def redirect(error, warning):
+    """Send reports made by the current thread to ``error``/``warning`` for the duration"""
+    previous = getattr(_local, "handlers", None)
+    _local.handlers = {"error": error, "warning": warning}
+    try:
+        yield
+    finally:
+        _local.handlers = previous
+
+
+def _handler(kind):
+    return (getattr(_local, "handlers", None) or _handlers)[kind]
+
+
+def error(message):
+    _handler("error")(message)
+
+
+def warning(message):
+    _handler("warning")(message)
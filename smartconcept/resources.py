@@ -0,0 +1,152 @@
+# === PROCESS-WIDE RESOURCES ===
+"""Caches, limiters, pools and clients shared by everything in this process."""
+
+import collections
+import functools
+import os
+import threading
+
+from smartconcept import config, tracing, tts
+from smartconcept.artifacts import ArtifactStore
+from smartconcept.cache import ResultCache
+from smartconcept.extraction import make_process_pool
+from smartconcept.gemini import GeminiClient
+from smartconcept.jobs import JobQueue
+from smartconcept.ratelimit import TokenBucket
+from smartconcept.retrieval import BM25Index, split_passages
+
+
+@functools.lru_cache(maxsize=None)
+def get_llm_cache():
+    """Cache of Gemini results, persisted on disk and shared across sessions"""
+    return ResultCache(
+        os.path.join(config.CACHE_DIR, "llm.sqlite3"),
+        max_bytes=config.LLM_CACHE_BYTES,
+        ttl=config.LLM_CACHE_TTL,
+    )
+
+
+@functools.lru_cache(maxsize=None)
+def get_extraction_cache():
+    """Cache of extracted document pages, keyed by upload content hash"""
+    return ResultCache(
+        os.path.join(config.CACHE_DIR, "extract.sqlite3"),
+        max_bytes=config.EXTRACT_CACHE_BYTES,
+        ttl=config.EXTRACT_CACHE_TTL,
+    )
+
+
+@functools.lru_cache(maxsize=None)
+def get_tts_cache():
+    """On-disk cache of synthesized audio chunks and files, shared across sessions"""
+    return ResultCache(
+        os.path.join(config.CACHE_DIR, "tts.sqlite3"),
+        max_bytes=config.TTS_CACHE_BYTES,
+        ttl=config.TTS_CACHE_TTL,
+        binary=True,
+    )
+
+
+@functools.lru_cache(maxsize=None)
+def get_tts_backend(name):
+    """Speech engine by name ("gtts", "espeak", "piper"); Piper's worker pool starts here"""
+    return tts.make_backend(name)
+
+
+@functools.lru_cache(maxsize=None)
+def get_artifact_store():
+    """Bounded store for generated audio; URLs are only offered inside the app's static/ folder"""
+    relative = os.path.relpath(os.path.abspath(config.ARTIFACT_DIR), os.path.join(config.APP_DIR, "static"))
+    url_prefix = None if relative.startswith("..") else "/app/static/" + relative.replace(os.sep, "/")
+    return ArtifactStore(
+        config.ARTIFACT_DIR,
+        max_bytes=config.ARTIFACT_MAX_BYTES,
+        session_max_bytes=config.ARTIFACT_SESSION_BYTES,
+        ttl=config.ARTIFACT_TTL,
+        url_prefix=url_prefix,
+    )
+
+
+@functools.lru_cache(maxsize=None)
+def get_gemini_rate_limiter():
+    """Token bucket shared by every Gemini call"""
+    return TokenBucket.per_minute(config.GEMINI_RPM)
+
+
+@functools.lru_cache(maxsize=None)
+def get_gemini_token_limiter():
+    """Token bucket for the tokens-per-minute quota"""
+    return TokenBucket.per_minute(config.GEMINI_TPM)
+
+
+@functools.lru_cache(maxsize=None)
+def get_gemini_client():
+    """Throttled, retrying, coalescing client every Gemini call goes through"""
+    return GeminiClient(
+        get_gemini_model,
+        get_gemini_rate_limiter(),
+        get_gemini_token_limiter(),
+        max_retries=config.GEMINI_MAX_RETRIES,
+        backoff=config.GEMINI_BACKOFF,
+        max_backoff=config.GEMINI_MAX_BACKOFF,
+        output_tokens=config.GEMINI_OUTPUT_TOKENS,
+    )
+
+
+@functools.lru_cache(maxsize=None)
+def get_extraction_pool():
+    """Process pool for page-parallel PDF extraction; None extracts in-process"""
+    if config.EXTRACT_WORKERS == 1:
+        return None
+    return make_process_pool(config.EXTRACT_WORKERS)
+
+
+@functools.lru_cache(maxsize=None)
+def get_job_queue():
+    """Background job queue for explanation and audio work"""
+    return JobQueue(max_workers=config.JOB_WORKERS, retention=config.JOB_RETENTION)
+
+
+_model_lock = threading.Lock()
+_gemini_model = None
+
+
+def get_gemini_model():
+    """Gemini model client, configured on first use."""
+    global _gemini_model
+    with _model_lock:
+        if _gemini_model is None:
+            if not config.GEMINI_API_KEY:
+                raise RuntimeError("GEMINI_API_KEY is not set; export your Gemini API key before starting the app")
+            import google.generativeai as genai
+
+            genai.configure(api_key=config.GEMINI_API_KEY)
+            _gemini_model = genai.GenerativeModel(config.GEMINI_MODEL_NAME)
+        return _gemini_model
+
+
+def set_gemini_model(model):
+    """Replace the Gemini model, e.g. with a local stand-in for benchmarks."""
+    global _gemini_model
+    with _model_lock:
+        _gemini_model = model
+
+
+_index_lock = threading.Lock()
+_retrieval_indexes = collections.OrderedDict()
+
+
+def get_retrieval_index(doc_key, pages):
+    """BM25 index over a document's passages, built once per document (LRU)"""
+    with _index_lock:
+        index = _retrieval_indexes.get(doc_key)
+        if index is not None:
+            _retrieval_indexes.move_to_end(doc_key)
+            return index
+    with tracing.span("retrieval.index", pages=len(pages)):
+        index = BM25Index(split_passages(pages))
+    with _index_lock:
+        _retrieval_indexes[doc_key] = index
+        while len(_retrieval_indexes) > config.RETRIEVAL_INDEX_ENTRIES:
+            _retrieval_indexes.popitem(last=False)
+    return index
@@ -0,0 +1,104 @@
+# === RETRIEVAL ===
+"""Page-aware passage splitting and an in-memory BM25 index.
+
+Used to send Gemini only the passages relevant to a concept or question
+instead of the first N characters of the document.
+"""
+
+import math
+import re
+from collections import Counter, namedtuple
+
+Passage = namedtuple("Passage", ["page", "text"])
+
+_TOKEN_RE = re.compile(r"\w+", re.UNICODE)
+_STOPWORDS = frozenset("""
+a an and are as at be by for from has have in is it its of on or that the this
+to was were what when where which who why will with how do does can you your
+""".split())
+
+
+def tokenize(text):
+    return [t for t in _TOKEN_RE.findall(text.lower()) if t not in _STOPWORDS]
+
+
+def split_passages(pages, max_chars=1200):
+    """Split page texts into passages of at most ~``max_chars`` that never span pages."""
+    passages = []
+    for page_no, page_text in enumerate(pages, start=1):
+        current = []
+        size = 0
+        for line in page_text.splitlines():
+            line = line.strip()
+            if not line:
+                continue
+            # Hard-wrap pathological lines so a single passage stays within budget
+            while len(line) > max_chars:
+                if current:
+                    passages.append(Passage(page_no, "\n".join(current)))
+                    current, size = [], 0
+                passages.append(Passage(page_no, line[:max_chars]))
+                line = line[max_chars:]
+            if size + len(line) > max_chars and current:
+                passages.append(Passage(page_no, "\n".join(current)))
+                current, size = [], 0
+            current.append(line)
+            size += len(line) + 1
+        if current:
+            passages.append(Passage(page_no, "\n".join(current)))
+    return passages
+
+
+class BM25Index:
+    """Okapi BM25 over a fixed list of passages."""
+
+    def __init__(self, passages, k1=1.5, b=0.75):
+        self.passages = list(passages)
+        self.k1 = k1
+        self.b = b
+        self._postings = {}
+        self._lengths = []
+        for doc_id, passage in enumerate(self.passages):
+            counts = Counter(tokenize(passage.text))
+            self._lengths.append(sum(counts.values()))
+            for token, tf in counts.items():
+                self._postings.setdefault(token, []).append((doc_id, tf))
+        n = len(self.passages)
+        self._avg_length = (sum(self._lengths) / n) if n else 0.0
+        self._idf = {
+            token: math.log(1 + (n - len(postings) + 0.5) / (len(postings) + 0.5))
+            for token, postings in self._postings.items()
+        }
+
+    def search(self, query, k=5):
+        """Return up to ``k`` ``(score, doc_id)`` pairs, best first."""
+        scores = Counter()
+        for token in set(tokenize(query)):
+            idf = self._idf.get(token)
+            if idf is None:
+                continue
+            for doc_id, tf in self._postings[token]:
+                norm = 1 - self.b + self.b * self._lengths[doc_id] / (self._avg_length or 1)
+                scores[doc_id] += idf * tf * (self.k1 + 1) / (tf + self.k1 * norm)
+        return [(score, doc_id) for doc_id, score in scores.most_common(k)]
+
+    def context_for(self, query, budget_chars=6000, k=8):
+        """Join the best passages for ``query`` in document order, within ``budget_chars``.
+
+        Falls back to the opening passages when nothing in the index matches.
+        """
+        hits = [doc_id for _, doc_id in self.search(query, k)]
+        if not hits:
+            hits = range(len(self.passages))
+        chosen = []
+        used = 0
+        for doc_id in hits:
+            passage = self.passages[doc_id]
+            block = f"[Page {passage.page}]\n{passage.text}"
+            if used + len(block) > budget_chars:
+                if chosen:
+                    break
+                block = block[:budget_chars]
+            chosen.append((doc_id, block))
+            used += len(block) + 2
+        return "\n\n".join(block for _, block in sorted(chosen))
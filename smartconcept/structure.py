@@ -0,0 +1,126 @@
+# === STRUCTURAL CONCEPT EXTRACTION ===
+"""Derive the concept list from document structure instead of asking the LLM.
+
+Works on already-opened PyMuPDF documents and python-pptx presentations, so
+this module does not import either library itself.
+"""
+
+import re
+from collections import Counter
+
+from smartconcept.concepts import merge_concepts
+
+# Fewer structural headings than this is treated as "no usable structure"
+MIN_STRUCTURAL_CONCEPTS = 3
+BOLD_FLAG = 16
+
+
+def _is_heading_text(text, max_len=100):
+    text = text.strip()
+    return (
+        3 <= len(text) <= max_len
+        and not re.fullmatch(r"[\d\W_]+", text)
+        and not re.fullmatch(r"(page|slide)\s*\d+", text, re.IGNORECASE)
+    )
+
+
+def concepts_from_toc(toc, max_level=2):
+    """Concepts from a PyMuPDF table of contents (``[[level, title, page], ...]``)."""
+    titles = [title.strip() for level, title, *_ in toc
+              if level <= max_level and _is_heading_text(title)]
+    return merge_concepts([titles])
+
+
+def page_font_lines(page):
+    """``(text, size, bold, chars_by_size)`` for each non-empty line of a PyMuPDF page."""
+    lines = []
+    for block in page.get_text("dict")["blocks"]:
+        for line in block.get("lines", []):
+            spans = [span for span in line["spans"] if span["text"].strip()]
+            if not spans:
+                continue
+            chars = Counter()
+            for span in spans:
+                chars[round(span["size"], 1)] += len(span["text"])
+            text = " ".join(span["text"].strip() for span in spans)
+            size = round(max(span["size"] for span in spans), 1)
+            bold = all(span["flags"] & BOLD_FLAG for span in spans)
+            lines.append((text, size, bold, dict(chars)))
+    return lines
+
+
+def concepts_from_font_lines(pages, size_ratio=1.15, max_heading_share=0.3):
+    """Concepts from lines set noticeably larger (or fully bold) compared to body text.
+
+    ``pages`` holds the ``page_font_lines`` of each page, in order.
+    """
+    sizes = Counter()
+    lines = []
+    for page_no, page_lines in enumerate(pages):
+        for text, size, bold, chars in page_lines:
+            sizes.update(chars)
+            lines.append((page_no, text, size, bold))
+    if not lines:
+        return []
+
+    body_size = sizes.most_common(1)[0][0]
+    candidates = [
+        (page_no, text) for page_no, text, size, bold in lines
+        if (size >= body_size * size_ratio or (bold and size >= body_size))
+        and _is_heading_text(text)
+    ]
+    # Bold or large text everywhere means the fonts carry no structure
+    if len(candidates) > max_heading_share * len(lines):
+        return []
+
+    # Drop running headers/footers that repeat on many pages
+    page_count = len({page_no for page_no, *_ in lines})
+    pages_per_text = Counter(t for _, t in set(candidates))
+    repeated = {t for t, n in pages_per_text.items() if n >= 3 and n > 0.3 * page_count}
+    return merge_concepts([[text for _, text in candidates if text not in repeated]])
+
+
+def concepts_from_fonts(doc, **kwargs):
+    """Font-based concepts read from an opened PyMuPDF document."""
+    return concepts_from_font_lines((page_font_lines(page) for page in doc), **kwargs)
+
+
+def concepts_from_slide_titles(prs):
+    """Concepts from the title placeholder of each slide."""
+    titles = []
+    for slide in prs.slides:
+        title = slide.shapes.title
+        if title is not None and title.has_text_frame and _is_heading_text(title.text):
+            titles.append(" ".join(title.text.split()))
+    # Continuation slides repeat their title; merging keeps the first one
+    return merge_concepts([titles])
+
+
+def _usable(concepts, source):
+    return (concepts, source) if len(concepts) >= MIN_STRUCTURAL_CONCEPTS else ([], None)
+
+
+def pdf_outline_concepts(doc):
+    """``(concepts, "outline")`` from the PDF bookmarks, or ``([], None)``."""
+    return _usable(concepts_from_toc(doc.get_toc()), "outline")
+
+
+def heading_concepts(font_lines):
+    """``(concepts, "headings")`` from per-page ``page_font_lines``, or ``([], None)``."""
+    return _usable(concepts_from_font_lines(font_lines), "headings")
+
+
+def pdf_structure_concepts(doc):
+    """Return ``(concepts, source)`` for a PDF, or ``([], None)`` when no structure is usable."""
+    structure = pdf_outline_concepts(doc)
+    if structure[0]:
+        return structure
+    return _usable(concepts_from_fonts(doc), "headings")
+
+
+def pptx_structure_concepts(prs):
+    """Return ``(concepts, source)`` for a presentation, or ``([], None)``."""
+    concepts = concepts_from_slide_titles(prs)
+    if len(concepts) >= MIN_STRUCTURAL_CONCEPTS:
+        return concepts, "slide titles"
+    return [], None
@@ -0,0 +1,314 @@
+# === TRACING ===
+"""Lightweight per-stage spans aggregated into process-wide histograms.
+
+Wrap a stage in ``span()`` and attach what is known about the work::
+
+    with tracing.span("llm.explain", prompt_chars=len(prompt)) as s:
+        text = model.generate_content(prompt).text
+        s.set(response_chars=len(text))
+
+Durations go into a latency histogram per span name. ``cache_hit`` attributes
+are counted as hits/misses, other numeric attributes are summed, and the most
+recent spans are kept verbatim for inspection. ``render_prometheus()`` and
+``snapshot()`` expose the data; ``start_exporter()`` serves or writes it for a
+local scraper.
+"""
+
+import bisect
+import collections
+import json
+import os
+import threading
+import time
+
+# Upper bounds (seconds) of the latency histogram buckets
+BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120)
+RECENT_SPANS = int(os.environ.get("SMARTCONCEPT_TRACE_RECENT", 200))
+ENABLED = os.environ.get("SMARTCONCEPT_TRACING", "1") == "1"
+
+
+class Histogram:
+    """Latency histogram over the fixed ``BUCKETS``."""
+
+    __slots__ = ("counts", "count", "sum", "max")
+
+    def __init__(self):
+        self.counts = [0] * (len(BUCKETS) + 1)
+        self.count = 0
+        self.sum = 0.0
+        self.max = 0.0
+
+    def observe(self, value):
+        self.counts[bisect.bisect_left(BUCKETS, value)] += 1
+        self.count += 1
+        self.sum += value
+        self.max = max(self.max, value)
+
+    def quantile(self, q):
+        """Estimate the ``q`` quantile by interpolating inside the bucket."""
+        if not self.count:
+            return 0.0
+        rank = q * self.count
+        seen = 0
+        for index, bucket_count in enumerate(self.counts):
+            if seen + bucket_count >= rank and bucket_count:
+                low = BUCKETS[index - 1] if index else 0.0
+                high = BUCKETS[index] if index < len(BUCKETS) else self.max
+                return min(low + (high - low) * (rank - seen) / bucket_count, self.max)
+            seen += bucket_count
+        return self.max
+
+
+class SpanStats:
+    """Everything aggregated for one span name."""
+
+    __slots__ = ("latency", "errors", "hits", "misses", "attributes")
+
+    def __init__(self):
+        self.latency = Histogram()
+        self.errors = 0
+        self.hits = 0
+        self.misses = 0
+        self.attributes = collections.Counter()
+
+
+class Span:
+    __slots__ = ("name", "attributes", "started", "duration", "error")
+
+    def __init__(self, name, attributes):
+        self.name = name
+        self.attributes = attributes
+        self.started = time.time()
+        self.duration = None
+        self.error = None
+
+    def set(self, **attributes):
+        self.attributes.update(attributes)
+        return self
+
+
+class Registry:
+    """Thread-safe store of span statistics and the most recent spans."""
+
+    def __init__(self, recent=RECENT_SPANS):
+        self._lock = threading.Lock()
+        self._stats = {}
+        self._recent = collections.deque(maxlen=recent)
+
+    def record(self, span):
+        with self._lock:
+            stats = self._stats.get(span.name)
+            if stats is None:
+                stats = self._stats[span.name] = SpanStats()
+            stats.latency.observe(span.duration)
+            if span.error:
+                stats.errors += 1
+            for key, value in span.attributes.items():
+                if key == "cache_hit":
+                    if value:
+                        stats.hits += 1
+                    else:
+                        stats.misses += 1
+                elif isinstance(value, (int, float)) and not isinstance(value, bool):
+                    stats.attributes[key] += value
+            self._recent.append(span)
+
+    def reset(self):
+        with self._lock:
+            self._stats.clear()
+            self._recent.clear()
+
+    def snapshot(self):
+        """JSON-serialisable view of all spans recorded so far."""
+        with self._lock:
+            spans = {}
+            for name, stats in sorted(self._stats.items()):
+                latency = stats.latency
+                spans[name] = {
+                    "count": latency.count,
+                    "errors": stats.errors,
+                    "sum_s": latency.sum,
+                    "mean_s": latency.sum / latency.count if latency.count else 0.0,
+                    "p50_s": latency.quantile(0.5),
+                    "p95_s": latency.quantile(0.95),
+                    "p99_s": latency.quantile(0.99),
+                    "max_s": latency.max,
+                    "buckets": dict(zip([str(b) for b in BUCKETS] + ["+Inf"], latency.counts)),
+                    "cache_hits": stats.hits,
+                    "cache_misses": stats.misses,
+                    "attributes": dict(stats.attributes),
+                }
+            recent = [
+                {
+                    "name": span.name,
+                    "started": span.started,
+                    "duration_s": span.duration,
+                    "error": span.error,
+                    "attributes": dict(span.attributes),
+                }
+                for span in self._recent
+            ]
+        return {"generated": time.time(), "spans": spans, "recent": recent}
+
+    def render_prometheus(self):
+        """Prometheus text exposition format (version 0.0.4)."""
+        lines = [
+            "# HELP smartconcept_span_duration_seconds Time spent in each pipeline stage.",
+            "# TYPE smartconcept_span_duration_seconds histogram",
+        ]
+        errors, cache, attributes = [], [], []
+        with self._lock:
+            for name, stats in sorted(self._stats.items()):
+                label = _escape(name)
+                cumulative = 0
+                for bound, bucket_count in zip(BUCKETS + ("+Inf",), stats.latency.counts):
+                    cumulative += bucket_count
+                    lines.append(
+                        f'smartconcept_span_duration_seconds_bucket{{span="{label}",le="{bound}"}} {cumulative}'
+                    )
+                lines.append(f'smartconcept_span_duration_seconds_sum{{span="{label}"}} {stats.latency.sum}')
+                lines.append(f'smartconcept_span_duration_seconds_count{{span="{label}"}} {stats.latency.count}')
+                errors.append(f'smartconcept_span_errors_total{{span="{label}"}} {stats.errors}')
+                if stats.hits or stats.misses:
+                    cache.append(f'smartconcept_span_cache_total{{span="{label}",result="hit"}} {stats.hits}')
+                    cache.append(f'smartconcept_span_cache_total{{span="{label}",result="miss"}} {stats.misses}')
+                for key, value in sorted(stats.attributes.items()):
+                    attributes.append(
+                        f'smartconcept_span_attribute_sum{{span="{label}",attribute="{_escape(key)}"}} {value}'
+                    )
+        lines += ["# HELP smartconcept_span_errors_total Spans that ended with an exception.",
+                  "# TYPE smartconcept_span_errors_total counter"] + errors
+        lines += ["# HELP smartconcept_span_cache_total Cache lookups made inside each stage.",
+                  "# TYPE smartconcept_span_cache_total counter"] + cache
+        lines += ["# HELP smartconcept_span_attribute_sum Sum of numeric span attributes.",
+                  "# TYPE smartconcept_span_attribute_sum counter"] + attributes
+        return "\n".join(lines) + "\n"
+
+
+def _escape(value):
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+registry = Registry()
+
+
+class _NullSpan:
+    def set(self, **attributes):
+        return self
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+_NULL_SPAN = _NullSpan()
+
+
+class _SpanContext:
+    __slots__ = ("_span", "_started")
+
+    def __init__(self, name, attributes):
+        self._span = Span(name, attributes)
+
+    def __enter__(self):
+        self._span.started = time.time()
+        self._started = time.perf_counter()
+        return self._span
+
+    def __exit__(self, exc_type, exc, tb):
+        current = self._span
+        current.duration = time.perf_counter() - self._started
+        if exc_type is not None:
+            current.error = exc_type.__name__
+        registry.record(current)
+        return False
+
+
+def span(name, **attributes):
+    """Context manager timing one stage; see the module docstring."""
+    if not ENABLED:
+        return _NULL_SPAN
+    return _SpanContext(name, attributes)
+
+
+def snapshot():
+    return registry.snapshot()
+
+
+def render_prometheus():
+    return registry.render_prometheus()
+
+
+def write_metrics(path):
+    """Atomically write the metrics to ``path``; ``.json`` selects JSON, else Prometheus text."""
+    body = json.dumps(snapshot(), indent=2) if path.endswith(".json") else render_prometheus()
+    tmp = f"{path}.tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        f.write(body)
+    os.replace(tmp, path)
+
+
+def _serve(port):
+    from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+    class MetricsHandler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            if self.path.rstrip("/") == "/metrics":
+                body, content_type = render_prometheus(), "text/plain; version=0.0.4"
+            elif self.path.rstrip("/") == "/metrics.json":
+                body, content_type = json.dumps(snapshot()), "application/json"
+            else:
+                self.send_error(404)
+                return
+            data = body.encode("utf-8")
+            self.send_response(200)
+            self.send_header("Content-Type", content_type)
+            self.send_header("Content-Length", str(len(data)))
+            self.end_headers()
+            self.wfile.write(data)
+
+        def log_message(self, format, *args):
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", port), MetricsHandler)
+    threading.Thread(target=server.serve_forever, name="smartconcept-metrics", daemon=True).start()
+    return server
+
+
+def _write_periodically(path, interval):
+    while True:
+        time.sleep(interval)
+        try:
+            write_metrics(path)
+        except OSError:
+            pass
+
+
+_exporter_lock = threading.Lock()
+_exporter_started = False
+
+
+def start_exporter(port=None, path=None, interval=None):
+    """Start the metrics exporter once per process.
+
+    ``port`` serves ``/metrics`` (Prometheus text) and ``/metrics.json`` on
+    localhost; ``path`` is rewritten every ``interval`` seconds. Both default to
+    ``SMARTCONCEPT_METRICS_PORT`` / ``SMARTCONCEPT_METRICS_FILE`` and are off
+    when unset.
+    """
+    global _exporter_started
+    with _exporter_lock:
+        if _exporter_started:
+            return
+        _exporter_started = True
+    port = port or int(os.environ.get("SMARTCONCEPT_METRICS_PORT", 0))
+    path = path or os.environ.get("SMARTCONCEPT_METRICS_FILE")
+    interval = interval or float(os.environ.get("SMARTCONCEPT_METRICS_INTERVAL", 15))
+    if port:
+        _serve(port)
+    if path:
+        threading.Thread(
+            target=_write_periodically, args=(path, interval), name="smartconcept-metrics-file", daemon=True
+        ).start()
@@ -0,0 +1,191 @@
+# === TTS BACKENDS ===
+"""Speech engines that turn one chunk of cleaned text into audio bytes.
+
+- ``gtts``: Google Translate TTS over HTTP (MP3). Needs the network.
+- ``espeak``: the local espeak-ng command (WAV), one short-lived process per
+  chunk; it starts in milliseconds and has English and Telugu voices.
+- ``piper``: local Piper neural voices (WAV, ``pip install piper-tts``). The
+  voice models are loaded once into a warm pool of worker processes and
+  chunks are routed to whichever worker is free.
+
+``SMARTCONCEPT_TTS_BACKEND`` picks the engine, either one name for every
+language or per language code, e.g. ``en=piper,te=espeak``. Backends are
+shared by the whole process (``resources.get_tts_backend``).
+"""
+
+import abc
+import io
+import os
+import subprocess
+import threading
+from concurrent.futures.process import BrokenProcessPool
+
+from smartconcept import config
+from smartconcept.extraction import make_process_pool
+
+# gTTS is imported on first synthesis; benchmarks may assign a stand-in here
+gTTS = None
+
+ESPEAK_VOICES = {"en": "en-us", "te": "te"}
+
+
+def get_tts_class():
+    global gTTS
+    if gTTS is None:
+        from gtts import gTTS as tts_class
+        gTTS = tts_class
+    return gTTS
+
+
+def parse_mapping(spec):
+    """``"en=a,te=b"`` -> ``{"en": "a", "te": "b"}``"""
+    pairs = (item.split("=", 1) for item in spec.split(",") if "=" in item)
+    return {lang.strip(): value.strip() for lang, value in pairs}
+
+
+def backend_name(lang_code, spec=None):
+    """Name of the backend configured for ``lang_code``"""
+    spec = spec if spec is not None else config.TTS_BACKEND
+    if "=" not in spec:
+        return spec.strip()
+    return parse_mapping(spec).get(lang_code, "gtts")
+
+
+def make_backend(name):
+    if name == "gtts":
+        return GTTSBackend()
+    if name == "espeak":
+        return EspeakBackend(config.ESPEAK_COMMAND)
+    if name == "piper":
+        return PiperBackend(parse_mapping(config.PIPER_VOICES), workers=config.PIPER_WORKERS)
+    raise ValueError(f"unknown TTS backend {name!r} (expected gtts, espeak or piper)")
+
+
+class TTSBackend(abc.ABC):
+    """Interface every engine implements.
+
+    ``format`` is the container of the returned chunks ("mp3" or "wav") and
+    ``key`` identifies the engine and its voices in cache keys, so audio from
+    different engines never mixes.
+    """
+
+    name = None
+    format = "mp3"
+
+    @property
+    def key(self):
+        return self.name
+
+    @abc.abstractmethod
+    def synthesize(self, text, lang_code, slow=False):
+        """Audio bytes (in ``format``) for one chunk of text."""
+
+
+class GTTSBackend(TTSBackend):
+    name = "gtts"
+
+    def synthesize(self, text, lang_code, slow=False):
+        tts = get_tts_class()(
+            text=text,
+            lang=lang_code,
+            slow=slow,
+            lang_check=False  # Bypass strict language checking
+        )
+        buffer = io.BytesIO()
+        tts.write_to_fp(buffer)
+        return buffer.getvalue()
+
+
+class EspeakBackend(TTSBackend):
+    name = "espeak"
+    format = "wav"
+
+    def __init__(self, command="espeak-ng", voices=None, timeout=120):
+        self.command = command
+        self.voices = voices or ESPEAK_VOICES
+        self.timeout = timeout
+
+    def synthesize(self, text, lang_code, slow=False):
+        args = [self.command, "--stdout", "--stdin", "-b", "1", "-v", self.voices.get(lang_code, lang_code)]
+        if slow:
+            args += ["-s", "120"]
+        result = subprocess.run(args, input=text.encode("utf-8"), capture_output=True, timeout=self.timeout)
+        if result.returncode != 0 or not result.stdout:
+            raise RuntimeError(f"espeak-ng failed: {result.stderr.decode('utf-8', 'replace').strip()}")
+        return result.stdout
+
+
+class PiperBackend(TTSBackend):
+    """Piper voices (``{lang_code: model path}``) served by ``workers`` processes.
+
+    Each worker loads every voice when it starts, and all workers are started
+    as soon as the backend is created, so the first chunk does not pay for
+    loading the models. A crashed pool is replaced on the next call.
+    """
+
+    name = "piper"
+    format = "wav"
+
+    def __init__(self, voices, workers=2, timeout=120):
+        missing = [path for path in voices.values() if not os.path.exists(path)]
+        if not voices or missing:
+            raise FileNotFoundError(f"Piper voice model(s) not found: {', '.join(missing) or '(none configured)'}")
+        self.voices = voices
+        self.workers = workers
+        self.timeout = timeout
+        self._lock = threading.Lock()
+        self._pool = None
+        self._get_pool()
+
+    @property
+    def key(self):
+        return "piper:" + ",".join(f"{lang}={os.path.basename(path)}" for lang, path in sorted(self.voices.items()))
+
+    def _get_pool(self):
+        with self._lock:
+            if self._pool is None:
+                self._pool = make_process_pool(self.workers, initializer=_load_piper_voices, initargs=(self.voices,))
+                # Spawn every worker now; each one loads the voices while we carry on
+                for _ in range(self.workers):
+                    self._pool.submit(_piper_ready)
+            return self._pool
+
+    def synthesize(self, text, lang_code, slow=False):
+        if lang_code not in self.voices:
+            raise ValueError(f"no Piper voice configured for {lang_code!r}")
+        pool = self._get_pool()
+        try:
+            return pool.submit(_piper_synthesize, text, lang_code, slow).result(timeout=self.timeout)
+        except BrokenProcessPool:
+            with self._lock:
+                if self._pool is pool:
+                    self._pool = None
+            raise
+
+
+# Piper voices loaded in this worker process, by language code
+_piper_voices = {}
+
+
+def _load_piper_voices(voices):
+    from piper import PiperVoice
+
+    for lang_code, path in voices.items():
+        _piper_voices[lang_code] = PiperVoice.load(path)
+
+
+def _piper_ready():
+    return len(_piper_voices)
+
+
+def _piper_synthesize(text, lang_code, slow):
+    import wave
+
+    from piper import SynthesisConfig
+
+    buffer = io.BytesIO()
+    with wave.open(buffer, "wb") as wav_file:
+        _piper_voices[lang_code].synthesize_wav(
+            text, wav_file, syn_config=SynthesisConfig(length_scale=1.5 if slow else None)
+        )
+    return buffer.getvalue()
@@ -0,0 +1,144 @@
+# === STREAMLIT UI HELPERS ===
+"""Static assets and session helpers for the Streamlit front end (app.py)."""
+
+import streamlit as st
+
+CUSTOM_CSS = """
+    <style>
+        html, body, .main {
+            background-color: var(--background-color);
+            color: var(--text-color);
+        }
+
+        /* Headers */
+        h1, h2, h3, h4, h5, h6 {
+            color: var(--text-color);
+            font-family: 'Segoe UI', Tahoma, Geneva, Verdana, sans-serif;
+        }
+
+        /* Sidebar */
+        .sidebar .sidebar-content {
+            background-color: var(--background-color);
+            box-shadow: 2px 0 10px rgba(0,0,0,0.1);
+        }
+
+        /* Buttons */
+        .stButton>button {
+            background-color: #3498db;
+            color: white;
+            border-radius: 5px;
+            padding: 8px 16px;
+            font-weight: 500;
+            transition: all 0.3s;
+            border: none;
+        }
+        .stButton>button:hover {
+            background-color: #2980b9;
+            transform: translateY(-1px);
+            box-shadow: 0 2px 5px rgba(0,0,0,0.2);
+        }
+
+        /* Select boxes */
+        .stSelectbox>div>div>select {
+            border: 1px solid #dfe6e9;
+            border-radius: 5px;
+            padding: 8px;
+        }
+
+        /* File uploader */
+        .stFileUploader>div>div {
+            border: 2px dashed #bdc3c7;
+            border-radius: 5px;
+            padding: 20px;
+        }
+
+        /* Cards */
+        .card {
+            background: var(--secondary-background-color);
+            border-radius: 10px;
+            box-shadow: 0 4px 6px rgba(0,0,0,0.1);
+            padding: 20px;
+            margin-bottom: 20px;
+            color: var(--text-color);
+        }
+
+        /* Divider */
+        .divider {
+            border-top: 1px solid #e0e0e0;
+            margin: 20px 0;
+        }
+
+        /* Audio player description */
+        .audio-caption {
+            font-size: 14px;
+            text-align: center;
+            color: var(--text-color);
+            margin-top: -10px;
+        }
+    </style>
+    <script>
+    const observer = new MutationObserver((mutations, obs) => {
+        document.documentElement.style.setProperty('--background-color', getComputedStyle(document.body).backgroundColor);
+        document.documentElement.style.setProperty('--secondary-background-color', getComputedStyle(document.body).backgroundColor === 'rgb(255, 255, 255)' ? '#ffffff' : '#1e1e1e');
+        document.documentElement.style.setProperty('--text-color', getComputedStyle(document.body).color);
+    });
+    observer.observe(document.body, { attributes: true, childList: true, subtree: true });
+    </script>
+    """
+
+# Per-session state and its initial values; copied so sessions never share objects
+SESSION_DEFAULTS = {
+    "concepts": [],
+    "explanations": {},
+    "audio_files": {},
+    "pdf_text": "",
+    "pdf_pages": [],
+    "concept_source": None,
+    "current_topic": None,
+    "chat_history": [],
+    "chat_summary": "",
+    "chat_summarized": 0,
+    "explanation_metrics": {},
+    "doc_key": None,
+    "upload_id": None,
+    "job_ids": [],
+    "collected_jobs": set(),
+}
+# Everything derived from the loaded document
+DOCUMENT_STATE = (
+    "concepts", "explanations", "audio_files", "explanation_metrics",
+    "pdf_text", "pdf_pages", "concept_source", "current_topic",
+    "job_ids", "collected_jobs",
+    # The chat memory is sent back to Gemini with every question
+    "chat_history", "chat_summary", "chat_summarized",
+)
+
+
+def inject_custom_css():
+    st.markdown(CUSTOM_CSS, unsafe_allow_html=True)
+
+
+def init_session_state():
+    for key, value in SESSION_DEFAULTS.items():
+        if key not in st.session_state:
+            st.session_state[key] = _fresh(value)
+
+
+def reset_document_state():
+    """Forget everything derived from the previously loaded document"""
+    for key in DOCUMENT_STATE:
+        st.session_state[key] = _fresh(SESSION_DEFAULTS[key])
+
+
+def _fresh(value):
+    return type(value)() if isinstance(value, (list, dict, set)) else value
+
+
+def explanation_card_html(topic, body):
+    return f"""
+                <div class='card'>
+                    <h3 style='color: #3498db;'>{topic}</h3>
+                    <div class='divider'></div>
+                    {body}
+                </div>
+                """
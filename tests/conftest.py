@@ -0,0 +1,30 @@
+import pytest
+
+
+class FakeClock:
+    """Stands in for the ``time`` module; ``sleep`` advances the clock."""
+
+    def __init__(self):
+        self.now = 1_000_000.0
+
+    def time(self):
+        return self.now
+
+    def monotonic(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.now += seconds
+
+
+@pytest.fixture
+def fake_clock(monkeypatch):
+    """``fake_clock(*modules)`` swaps ``time`` in each module for one shared ``FakeClock``."""
+    clock = FakeClock()
+
+    def install(*modules):
+        for module in modules:
+            monkeypatch.setattr(module, "time", clock)
+        return clock
+
+    return install
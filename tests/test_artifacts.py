@@ -0,0 +1,160 @@
+import collections
+import gc
+import os
+
+import pytest
+
+from smartconcept import artifacts
+from smartconcept.artifacts import SWEEP_INTERVAL, ArtifactStore, SessionArtifacts
+
+
+@pytest.fixture
+def clock(fake_clock):
+    return fake_clock(artifacts)
+
+
+def make_store(tmp_path, max_bytes=100, session_max_bytes=100, ttl=3600, **kwargs):
+    return ArtifactStore(str(tmp_path / "artifacts"), max_bytes, session_max_bytes, ttl, **kwargs)
+
+
+def files_on_disk(store):
+    """``{artifact id: size}`` of every file under the store's root."""
+    found = {}
+    for folder, _, names in os.walk(store.root):
+        for name in names:
+            path = os.path.join(folder, name)
+            found[os.path.relpath(path, store.root).replace(os.sep, "/")] = os.path.getsize(path)
+    return found
+
+
+def assert_consistent(store):
+    on_disk = files_on_disk(store)
+    assert set(store._entries) == set(on_disk)
+    per_session = collections.Counter()
+    for artifact_id, size in on_disk.items():
+        per_session[artifact_id.split("/")[0]] += size
+    assert dict(store._session_bytes) == dict(per_session)
+    assert store.stats() == {"files": len(on_disk), "bytes": sum(on_disk.values()), "sessions": len(per_session)}
+
+
+def test_put_stores_and_deduplicates(tmp_path):
+    store = make_store(tmp_path, url_prefix="/app/static/artifacts")
+    first = store.put("s1", b"audio", ".mp3")
+    assert store.put("s1", b"audio", ".mp3") == first
+    assert first.startswith("s1/") and first.endswith(".mp3")
+    with open(store.path(first), "rb") as f:
+        assert f.read() == b"audio"
+    assert store.url(first) == f"/app/static/artifacts/{first}"
+    # The same bytes in another session are that session's own file
+    assert store.put("s2", b"audio", ".mp3") != first
+    assert_consistent(store)
+
+
+def test_session_quota_evicts_that_sessions_oldest_files(tmp_path, clock):
+    store = make_store(tmp_path, session_max_bytes=10)
+    other = store.put("s2", b"x" * 8)
+    ids = []
+    for fill in b"abc":
+        ids.append(store.put("s1", bytes([fill]) * 4))
+        clock.sleep(1)
+    assert store.path(ids[0]) is None
+    assert not os.path.exists(os.path.join(store.root, *ids[0].split("/")))
+    assert store.path(ids[1]) and store.path(ids[2]) and store.path(other)
+    assert_consistent(store)
+
+
+def test_recent_use_protects_a_file_from_eviction(tmp_path, clock):
+    store = make_store(tmp_path, session_max_bytes=10)
+    old = store.put("s1", b"a" * 4)
+    middle = store.put("s1", b"b" * 4)
+    store.path(old)  # marks it used
+    store.put("s1", b"c" * 4)
+    assert store.path(middle) is None and store.path(old) is not None
+    assert_consistent(store)
+
+
+def test_global_quota_evicts_across_sessions(tmp_path, clock):
+    store = make_store(tmp_path, max_bytes=10)
+    first = store.put("s1", b"a" * 4)
+    second = store.put("s2", b"b" * 4)
+    third = store.put("s3", b"c" * 4)
+    assert store.path(first) is None
+    assert store.path(second) and store.path(third)
+    assert_consistent(store)
+
+
+def test_a_file_larger_than_the_quota_is_kept(tmp_path):
+    store = make_store(tmp_path, max_bytes=10, session_max_bytes=10)
+    small = store.put("s1", b"a" * 4)
+    big = store.put("s1", b"b" * 20)
+    assert store.path(small) is None and store.path(big) is not None
+    assert_consistent(store)
+
+
+def test_sweep_removes_files_unused_for_ttl(tmp_path, clock):
+    store = make_store(tmp_path, ttl=SWEEP_INTERVAL * 2)
+    stale = store.put("s1", b"stale")
+    fresh = store.put("s2", b"fresh")
+    clock.sleep(SWEEP_INTERVAL)
+    store.path(fresh)
+    clock.sleep(SWEEP_INTERVAL + 1)
+    newest = store.put("s3", b"new")
+    assert store.path(stale) is None
+    assert store.path(fresh) and store.path(newest)
+    assert_consistent(store)
+
+
+def test_sweep_runs_at_most_once_per_interval(tmp_path, clock):
+    store = make_store(tmp_path, ttl=1)
+    first = store.put("s1", b"one")
+    clock.sleep(2)
+    store.put("s1", b"two")  # less than SWEEP_INTERVAL since start: no sweep yet
+    assert store.path(first) is not None
+    clock.sleep(SWEEP_INTERVAL)
+    store.put("s1", b"three")
+    assert store.path(first) is None
+    assert_consistent(store)
+
+
+def test_orphans_from_an_earlier_process_are_adopted(tmp_path):
+    root = tmp_path / "artifacts"
+    (root / "old").mkdir(parents=True)
+    for name, data, mtime in (("a.mp3", b"a" * 6, 100), ("b.mp3", b"b" * 6, 200)):
+        path = root / "old" / name
+        path.write_bytes(data)
+        os.utime(path, (mtime, mtime))
+    (root / "old" / "c.mp3.tmp").write_bytes(b"partial")
+    (root / "stray.txt").write_bytes(b"not a session")
+
+    store = make_store(tmp_path, max_bytes=20)
+    assert not (root / "old" / "c.mp3.tmp").exists()
+    assert store.stats() == {"files": 2, "bytes": 12, "sessions": 1}
+    # Quotas apply to adopted files, oldest (by mtime) first
+    store.put("new", b"n" * 10)
+    assert store.path("old/a.mp3") is None and not (root / "old" / "a.mp3").exists()
+    assert store.path("old/b.mp3") is not None
+    os.remove(root / "stray.txt")
+    assert_consistent(store)
+
+
+def test_clear_deletes_the_sessions_files(tmp_path):
+    store = make_store(tmp_path)
+    handle = SessionArtifacts(store, "s1")
+    kept = store.put("s2", b"other")
+    artifact_id = handle.put(b"audio", ".mp3")
+    handle.clear()
+    assert handle.path(artifact_id) is None
+    assert not os.path.exists(os.path.join(store.root, "s1"))
+    assert store.path(kept) is not None
+    assert_consistent(store)
+
+
+def test_dropped_session_handle_deletes_its_files(tmp_path):
+    store = make_store(tmp_path)
+    handle = SessionArtifacts(store, "s1")
+    handle.put(b"audio", ".mp3")
+    assert store.stats()["files"] == 1
+    del handle
+    gc.collect()
+    assert store.stats() == {"files": 0, "bytes": 0, "sessions": 0}
+    assert not os.path.exists(os.path.join(store.root, "s1"))
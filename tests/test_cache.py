@@ -0,0 +1,102 @@
+import pytest
+
+from smartconcept import cache
+from smartconcept.cache import ResultCache, make_key
+
+
+@pytest.fixture
+def clock(fake_clock):
+    return fake_clock(cache)
+
+
+def make_cache(tmp_path, **kwargs):
+    return ResultCache(str(tmp_path / "cache.sqlite"), **kwargs)
+
+
+def test_make_key_separates_parts():
+    assert make_key("ab", "c") != make_key("a", "bc")
+    assert make_key("a", b"a") == make_key(b"a", "a")
+
+
+def test_values_round_trip_and_are_shared_through_the_file(tmp_path):
+    results = make_cache(tmp_path)
+    results.set("concepts", ["Mean", "Median"])
+    assert results.get("concepts") == ["Mean", "Median"]
+    assert make_cache(tmp_path).get("concepts") == ["Mean", "Median"]
+    assert results.get("missing", default="none") == "none"
+
+    audio = ResultCache(str(tmp_path / "audio.sqlite"), binary=True)
+    audio.set("chunk", b"\xff\xfb\x90")
+    assert audio.get("chunk") == b"\xff\xfb\x90"
+
+
+def test_hits_and_misses_are_counted(tmp_path):
+    results = make_cache(tmp_path)
+    results.get("a")
+    results.set("a", 1)
+    results.get("a")
+    results.get("a")
+    assert results.stats() == {"hits": 2, "misses": 1, "evictions": 0, "entries": 1, "bytes": 1}
+    results.clear()
+    assert results.stats() == {"hits": 0, "misses": 0, "evictions": 0, "entries": 0, "bytes": 0}
+
+
+def test_eviction_drops_least_recently_accessed_first(tmp_path, clock):
+    # JSON "xxxx" is 6 bytes, so two entries fit
+    results = make_cache(tmp_path, max_bytes=12)
+    results.set("a", "xxxx")
+    clock.sleep(1)
+    results.set("b", "xxxx")
+    clock.sleep(1)
+    assert results.get("a") == "xxxx"  # a is now more recent than b
+    clock.sleep(1)
+    results.set("c", "xxxx")
+    assert results.get("b") is None
+    assert results.get("a") == "xxxx" and results.get("c") == "xxxx"
+    stats = results.stats()
+    assert (stats["evictions"], stats["entries"], stats["bytes"]) == (1, 2, 12)
+
+
+def test_eviction_removes_as_many_entries_as_needed(tmp_path, clock):
+    results = make_cache(tmp_path, max_bytes=12)
+    for key in ("a", "b"):
+        results.set(key, "xxxx")
+        clock.sleep(1)
+    results.set("big", "x" * 8)
+    assert results.get("a") is None and results.get("b") is None
+    assert results.get("big") == "x" * 8
+    assert results.stats()["evictions"] == 2
+
+
+def test_entries_expire_after_ttl(tmp_path, clock):
+    results = make_cache(tmp_path, ttl=60)
+    results.set("old", 1)
+    clock.sleep(30)
+    assert results.get("old") == 1
+    # Access does not extend the lifetime
+    clock.sleep(31)
+    assert results.get("old") is None
+    assert results.stats()["entries"] == 0
+
+
+def test_expired_entries_are_purged_on_write(tmp_path, clock):
+    results = make_cache(tmp_path, ttl=60)
+    results.set("old", 1)
+    clock.sleep(61)
+    results.set("new", 2)
+    assert results.stats()["entries"] == 1
+    assert results.get("new") == 2
+
+
+def test_get_or_compute_caches_only_successful_results(tmp_path):
+    results = make_cache(tmp_path)
+    calls = []
+
+    def compute():
+        calls.append(1)
+        return None if len(calls) == 1 else "value"
+
+    assert results.get_or_compute("k", compute) is None
+    assert results.get_or_compute("k", compute) == "value"
+    assert results.get_or_compute("k", compute) == "value"
+    assert len(calls) == 2
@@ -0,0 +1,143 @@
+import threading
+
+import pytest
+
+from smartconcept import gemini, ratelimit
+from smartconcept.gemini import GeminiClient
+from smartconcept.ratelimit import TokenBucket
+
+
+class ResourceExhausted(Exception):
+    """Same class name as the google.api_core 429 error."""
+
+
+class Response:
+    def __init__(self, text, tokens=None):
+        self.text = text
+        self.usage_metadata = type("Usage", (), {"total_token_count": tokens})()
+
+
+class Model:
+    """Fails with each error in ``errors`` first, then echoes the prompt."""
+
+    def __init__(self, errors=(), gate=None, tokens=None):
+        self.errors = list(errors)
+        self.gate = gate
+        self.tokens = tokens
+        self.calls = 0
+
+    def generate_content(self, prompt, stream=False):
+        self.calls += 1
+        if self.gate is not None:
+            self.gate.wait(5)
+        if self.errors:
+            raise self.errors.pop(0)
+        if stream:
+            return iter([Response(prompt[:2]), Response(prompt[2:], self.tokens)])
+        return Response(prompt, self.tokens)
+
+
+def make_client(model, tokens=None, **kwargs):
+    kwargs.setdefault("backoff", 0.001)
+    return GeminiClient(lambda: model, TokenBucket(1000, 1000), tokens, **kwargs)
+
+
+@pytest.fixture
+def clock(fake_clock):
+    return fake_clock(ratelimit)
+
+
+def test_concurrent_callers_join_the_in_flight_call():
+    gate = threading.Event()
+    model = Model(gate=gate)
+    client = make_client(model)
+    first = client.stream("same prompt")
+    second = client.stream("same prompt")
+    assert client.in_flight() == 1
+    gate.set()
+    assert "".join(first) == "".join(second) == "same prompt"
+    assert model.calls == 1
+    # Once finished the result is no longer shared
+    assert client.generate("same prompt") == "same prompt"
+    assert model.calls == 2
+
+
+def test_failure_is_raised_to_every_joined_caller():
+    gate = threading.Event()
+    client = make_client(Model(errors=[ValueError("bad prompt")], gate=gate))
+    first, second = client.stream("p"), client.stream("p")
+    gate.set()
+    for flight in (first, second):
+        with pytest.raises(ValueError):
+            list(flight)
+
+
+def test_rate_limit_errors_are_retried():
+    model = Model(errors=[ResourceExhausted("429"), ResourceExhausted("429")])
+    assert make_client(model).generate("prompt") == "prompt"
+    assert model.calls == 3
+
+
+def test_retries_give_up_after_max_retries():
+    model = Model(errors=[ResourceExhausted("429")] * 3)
+    with pytest.raises(ResourceExhausted):
+        make_client(model, max_retries=2).generate("prompt")
+    assert model.calls == 3
+
+
+def test_other_errors_are_not_retried():
+    model = Model(errors=[ValueError("bad prompt")])
+    with pytest.raises(ValueError):
+        make_client(model).generate("prompt")
+    assert model.calls == 1
+
+
+def test_backoff_is_capped_exponential(monkeypatch):
+    delays = []
+    monkeypatch.setattr(gemini.random, "uniform", lambda low, high: high)
+    monkeypatch.setattr(gemini.time, "sleep", delays.append)
+    model = Model(errors=[ResourceExhausted("429")] * 4)
+    make_client(model, backoff=1.0, max_backoff=5.0).generate("prompt")
+    assert delays == [1.0, 2.0, 4.0, 5.0]
+
+
+def test_token_usage_is_settled_against_the_amount_acquired(clock):
+    tokens = TokenBucket(1, 1000)
+    # The estimate (prompt + 5000 output tokens) is clipped to the bucket size
+    client = make_client(Model(tokens=400), tokens, output_tokens=5000)
+    client.generate("prompt")
+    assert tokens._tokens == pytest.approx(600)
+
+
+def test_bucket_refills_at_its_rate(clock):
+    bucket = TokenBucket(rate=2, capacity=4)
+    assert all(bucket.try_acquire() for _ in range(4))
+    assert not bucket.try_acquire()
+    clock.sleep(1.0)
+    assert bucket.try_acquire(2)
+    assert not bucket.try_acquire()
+    # Idle time never fills it beyond capacity
+    clock.sleep(60)
+    assert bucket.try_acquire(4)
+    assert not bucket.try_acquire()
+
+
+def test_acquire_waits_for_refill(clock):
+    bucket = TokenBucket.per_minute(60, burst=1)
+    assert bucket.acquire()
+    start = clock.now
+    assert bucket.acquire()
+    assert clock.now - start == pytest.approx(1.0)
+    assert not bucket.acquire(timeout=0.5)
+    with pytest.raises(ValueError):
+        bucket.acquire(2)
+
+
+def test_adjust_puts_the_bucket_in_debt(clock):
+    bucket = TokenBucket(rate=10, capacity=10)
+    bucket.adjust(15)
+    assert not bucket.try_acquire()
+    clock.sleep(0.5)
+    assert not bucket.try_acquire()
+    clock.sleep(0.2)
+    assert bucket.try_acquire()
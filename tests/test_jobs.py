@@ -0,0 +1,142 @@
+import threading
+import time
+
+import pytest
+
+from smartconcept import reporting
+from smartconcept.jobs import CANCELLED, DONE, FAILED, PENDING, RUNNING, JobQueue
+
+
+def blocked(job, gate, result="ok", timeout=10):
+    """Job body that waits for ``gate``, noticing cancellation meanwhile."""
+    deadline = time.monotonic() + timeout
+    while not gate.wait(0.01):
+        job.check_cancelled()
+        if time.monotonic() > deadline:
+            raise TimeoutError("gate was never opened")
+    return result
+
+
+def failing(job):
+    raise ValueError("boom")
+
+
+def wait_for(condition, timeout=5):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline, "timed out"
+        time.sleep(0.01)
+
+
+@pytest.fixture
+def queue():
+    return JobQueue(max_workers=1)
+
+
+def test_submit_joins_active_and_done_jobs(queue):
+    gate = threading.Event()
+    job = queue.submit("work", "key", blocked, gate)
+    assert queue.submit("work", "key", blocked, gate) is job
+    gate.set()
+    assert job.wait(5) == DONE and job.result == "ok"
+    assert queue.submit("work", "key", blocked, gate) is job
+    assert queue.submit("work", "other", blocked, gate) is not job
+
+
+def test_submit_retries_failed_and_cancelled_jobs(queue):
+    failed = queue.submit("work", "fails", failing)
+    assert failed.wait(5) == FAILED
+    assert failed.error == "ValueError: boom"
+    assert queue.submit("work", "fails", failing) is not failed
+
+    gate = threading.Event()
+    cancelled = queue.submit("work", "cancelled", blocked, gate)
+    queue.cancel(cancelled.id)
+    assert cancelled.wait(5) == CANCELLED
+    assert queue.submit("work", "cancelled", blocked, gate) is not cancelled
+    gate.set()
+
+
+def test_detach_cancels_only_after_the_last_watcher(queue):
+    gate = threading.Event()
+    job = queue.submit("work", "key", blocked, gate)
+    queue.attach(job.id)
+    queue.attach(job.id)
+    assert queue.detach(job.id) is False
+    assert job.watchers == 1 and not job.cancel_requested
+    assert queue.detach(job.id) is True
+    assert job.wait(5) == CANCELLED
+    # Detaching from a finished or unknown job is harmless
+    assert queue.detach(job.id) is False
+    assert queue.detach("missing-1") is False
+
+
+def test_cancel_pending_job_stops_it_at_once(queue):
+    gate = threading.Event()
+    running = queue.submit("work", "first", blocked, gate)
+    wait_for(lambda: running.status == RUNNING)
+    pending = queue.submit("work", "second", blocked, gate)
+    assert pending.status == PENDING
+    assert queue.cancel(pending.id) is True
+    assert pending.status == CANCELLED and pending.started is None
+    gate.set()
+    assert running.wait(5) == DONE
+
+
+def test_cancel_running_job_stops_at_its_next_check(queue):
+    gate = threading.Event()
+    job = queue.submit("work", "key", blocked, gate)
+    wait_for(lambda: job.status == RUNNING)
+    assert queue.cancel(job.id) is True
+    assert job.wait(5) == CANCELLED
+    assert job.result is None
+    assert queue.cancel(job.id) is False
+
+
+def test_reports_from_the_job_thread_become_warnings(queue):
+    def work(job):
+        reporting.warning("one chunk failed")
+        return "partial"
+
+    job = queue.submit("work", "key", work)
+    assert job.wait(5) == DONE
+    assert job.warnings == ["one chunk failed"]
+
+
+def test_list_filters_by_group_and_status(queue):
+    done = queue.submit("work", "a", lambda job: "ok", group="doc-1")
+    failed = queue.submit("work", "b", failing, group="doc-1")
+    other = queue.submit("work", "c", lambda job: "ok", group="doc-2")
+    for job in (done, failed, other):
+        job.wait(5)
+    assert queue.list(group="doc-1", statuses=(DONE,)) == [done]
+    assert queue.list(group="doc-1") == [done, failed]
+    assert queue.list(statuses=(DONE,)) == [done, other]
+
+
+def test_prune_forgets_finished_jobs_past_retention(queue):
+    gate = threading.Event()
+    old = queue.submit("work", "old", lambda job: "ok")
+    assert old.wait(5) == DONE
+    active = queue.submit("work", "active", blocked, gate)
+    old.finished -= 2 * queue.retention
+    assert queue.list() == [active]
+    assert queue.get(old.id) is None
+    # The key is free again, so the same work can be submitted anew
+    assert queue.submit("work", "old", lambda job: "ok") is not old
+    gate.set()
+
+
+def test_prune_keeps_at_most_max_jobs():
+    queue = JobQueue(max_workers=1, max_jobs=2)
+    finished = []
+    for key in ("a", "b", "c"):
+        job = queue.submit("work", key, lambda job: "ok")
+        assert job.wait(5) == DONE
+        finished.append(job)
+    assert queue.list() == finished[1:]
+    # Active jobs are never pruned, even over the limit
+    gate = threading.Event()
+    active = [queue.submit("work", key, blocked, gate) for key in ("x", "y", "z")]
+    assert queue.list() == active
+    gate.set()
@@ -0,0 +1,121 @@
+import json
+import re
+
+import pytest
+
+from smartconcept import llm, resources
+from smartconcept.cache import ResultCache
+from smartconcept.gemini import GeminiClient
+from smartconcept.llm import explain_concepts, parse_explanation_batch
+from smartconcept.ratelimit import TokenBucket
+
+CONCEPTS = ["Mean", "Standard Deviation", "Permutations"]
+
+
+class Response:
+    def __init__(self, text):
+        self.text = text
+        self.usage_metadata = None
+
+
+class Model:
+    """Answers batched prompts with ``batch_answer(topics)`` and single prompts per topic."""
+
+    def __init__(self, batch_answer):
+        self.batch_answer = batch_answer
+        self.batch_calls = []
+        self.single_calls = []
+
+    def generate_content(self, prompt, stream=False):
+        if "OUTPUT FORMAT" in prompt:
+            topics = re.findall(r"^- (.+)$", prompt.split("Topics:", 1)[1].split("\n\n", 1)[0], re.M)
+            self.batch_calls.append(topics)
+            text = self.batch_answer(topics)
+            if isinstance(text, Exception):
+                raise text
+        else:
+            topic = re.search(r"topic '([^']*)'", prompt).group(1)
+            self.single_calls.append(topic)
+            text = f"single: {topic}"
+        return iter([Response(text)]) if stream else Response(text)
+
+
+@pytest.fixture
+def use_model(tmp_path, monkeypatch):
+    """``use_model(batch_answer)`` routes the pipeline's Gemini calls to a fresh ``Model``."""
+    cache = ResultCache(str(tmp_path / "llm.sqlite"))
+    monkeypatch.setattr(resources, "get_llm_cache", lambda: cache)
+
+    def install(batch_answer):
+        model = Model(batch_answer)
+        client = GeminiClient(lambda: model, TokenBucket(1000, 1000), max_retries=0)
+        monkeypatch.setattr(resources, "get_gemini_client", lambda: client)
+        return model
+
+    return install
+
+
+def test_parse_plain_json():
+    text = json.dumps({"Mean": " The average. ", "Standard Deviation": "Spread."})
+    assert parse_explanation_batch(text, CONCEPTS) == {"Mean": "The average.", "Standard Deviation": "Spread."}
+
+
+def test_parse_fenced_and_noisy_json():
+    text = 'Sure! Here you go:\n```json\n{"Mean": "The average {of values}."}\n```\nHope this helps.'
+    assert parse_explanation_batch(text, CONCEPTS) == {"Mean": "The average {of values}."}
+
+
+@pytest.mark.parametrize("text", ["no json here", "{not valid json}", '["Mean", "list"]', "}{", ""])
+def test_parse_unusable_responses_give_nothing(text):
+    assert parse_explanation_batch(text, CONCEPTS) == {}
+
+
+def test_parse_matches_keys_by_signature():
+    text = json.dumps({"standard deviation": "Spread.", "PERMUTATION": "Orderings.", "Median": "Middle."})
+    assert parse_explanation_batch(text, CONCEPTS) == {"Standard Deviation": "Spread.", "Permutations": "Orderings."}
+
+
+def test_parse_skips_empty_and_non_string_values_and_duplicates():
+    text = '{"Mean": "First.", "mean": "Second.", "Standard Deviation": "  ", "Permutations": {"a": 1}}'
+    assert parse_explanation_batch(text, CONCEPTS) == {"Mean": "First."}
+
+
+def test_batch_answer_is_used_and_cached(use_model):
+    model = use_model(lambda topics: json.dumps({t: f"batched: {t}" for t in topics}))
+    result = explain_concepts(CONCEPTS, "context", "English")
+    assert result == {c: f"batched: {c}" for c in CONCEPTS}
+    assert list(result) == CONCEPTS
+    assert model.batch_calls == [CONCEPTS] and model.single_calls == []
+    # Shares explain_concept's cache key, so a single explanation is a cache hit
+    assert llm.explain_concept("Mean", "context", "English") == "batched: Mean"
+    assert model.single_calls == []
+
+
+def test_concepts_missing_from_the_answer_fall_back_to_single_calls(use_model):
+    model = use_model(lambda topics: json.dumps({"mean": "batched: Mean"}))
+    result = explain_concepts(CONCEPTS, "context", "English")
+    assert result == {
+        "Mean": "batched: Mean",
+        "Standard Deviation": "single: Standard Deviation",
+        "Permutations": "single: Permutations",
+    }
+    assert sorted(model.single_calls) == ["Permutations", "Standard Deviation"]
+
+
+def test_unparseable_or_failed_batch_falls_back_for_every_concept(use_model):
+    answers = [lambda topics: "I cannot answer in JSON", lambda topics: RuntimeError("server error")]
+    for index, answer in enumerate(answers):
+        model = use_model(answer)
+        # A new context each time, so nothing is served from the cache
+        result = explain_concepts(CONCEPTS, f"context {index}", "English")
+        assert result == {c: f"single: {c}" for c in CONCEPTS}
+        assert sorted(model.single_calls) == sorted(CONCEPTS)
+
+
+def test_cached_concepts_are_not_asked_again(use_model):
+    model = use_model(lambda topics: json.dumps({t: f"batched: {t}" for t in topics}))
+    explain_concepts(["Mean", "Standard Deviation"], "context", "English")
+    explain_concepts(CONCEPTS, "context", "English")
+    # Only one concept was left, so it went out as a single call
+    assert model.batch_calls == [["Mean", "Standard Deviation"]]
+    assert model.single_calls == ["Permutations"]
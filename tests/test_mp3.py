@@ -0,0 +1,70 @@
+from smartconcept import mp3
+
+# MPEG-1 Layer III, 128 kbps, 44.1 kHz, mono, no padding: 417-byte frames
+HEADER = b"\xff\xfb\x90\xc0"
+HEADER_48K = b"\xff\xfb\x94\xc0"
+
+
+def frame(fill, header=HEADER):
+    length = mp3.parse_header(header, 0).length
+    return header + bytes([fill]) * (length - 4)
+
+
+def xing_frame():
+    data = bytearray(frame(0))
+    side_info = mp3.parse_header(HEADER, 0).side_info_size
+    data[4 + side_info:8 + side_info] = b"Xing"
+    return bytes(data)
+
+
+def id3v2_tag(body):
+    size = len(body)
+    syncsafe = bytes([(size >> 21) & 0x7F, (size >> 14) & 0x7F, (size >> 7) & 0x7F, size & 0x7F])
+    return b"ID3\x03\x00\x00" + syncsafe + body
+
+
+def id3v1_tag():
+    return b"TAG" + bytes(125)
+
+
+def test_parse_header():
+    header = mp3.parse_header(HEADER, 0)
+    assert (header.bitrate, header.sample_rate, header.channels) == (128000, 44100, 1)
+    assert header.length == 417
+    assert header.samples == 1152
+    assert mp3.parse_header(b"\x00\x00\x00\x00", 0) is None
+    assert mp3.parse_header(HEADER[:3], 0) is None
+
+
+def test_iter_frames_skips_tags_and_xing_header():
+    # The ID3v2 body contains a frame sync that must not be taken for audio
+    data = id3v2_tag(b"TIT2" + HEADER + bytes(20)) + xing_frame() + frame(1) + frame(2) + id3v1_tag()
+    frames = [payload for _, payload in mp3.iter_frames(data)]
+    assert frames == [frame(1), frame(2)]
+
+
+def test_iter_frames_resyncs_after_junk():
+    data = frame(1) + b"\x00junk\x00" + frame(2)
+    assert [payload for _, payload in mp3.iter_frames(data)] == [frame(1), frame(2)]
+
+
+def test_join_mp3_concatenates_frames():
+    first = id3v2_tag(b"x" * 30) + xing_frame() + frame(1)
+    second = id3v2_tag(b"y" * 30) + xing_frame() + frame(2) + frame(3) + id3v1_tag()
+    assert mp3.join_mp3([first, second]) == frame(1) + frame(2) + frame(3)
+
+
+def test_join_mp3_inserts_silence_between_parts():
+    joined = mp3.join_mp3([frame(1), frame(2)], pause_ms=300)
+    frames = [payload for _, payload in mp3.iter_frames(joined)]
+    assert frames[0] == frame(1) and frames[-1] == frame(2)
+    silence = frames[1:-1]
+    # 300 ms at 1152 samples per 44.1 kHz frame
+    assert len(silence) == round(0.3 * 44100 / 1152)
+    assert all(payload[4:] == bytes(len(payload) - 4) for payload in silence)
+
+
+def test_join_mp3_rejects_mismatched_or_empty_parts():
+    assert mp3.join_mp3([frame(1), frame(2, HEADER_48K)]) is None
+    assert mp3.join_mp3([frame(1), b"not audio"]) is None
+    assert mp3.join_mp3([]) is None
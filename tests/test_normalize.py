@@ -0,0 +1,88 @@
+import random
+import re
+
+import pytest
+
+from smartconcept.normalize import Normalizer, normalize
+
+# The str.replace chains the normalizers replaced, as they ran in app.py
+LEGACY_TELUGU = {
+    "ఉదా.": "ఉదాహరణకు", "అంటే": "అంటే ", "అనగా": "అనగా ", "-": " మైనస్ ",
+    "(": ", ", ")": ", ", "[": ", ", "]": ", ", "{": ", ", "}": ", ",
+    "!": "ఫ్యాక్టోరియల్", "•": "", "x": "ఇన్టూ", "=": " ఈక్వల్టూ ", "+": " ప్లస్ ",
+    "/": " డివైడెడ్బై ", "∩": "ఇంటర్సెక్షన్", "∪": "యూనియన్", "÷": "డివైడెడ్బై",
+    "Σ": "సమ్మషన్", "^": " పవర్ ", "%": " పర్సెంట్ ", "°C": " డిగ్రీల సెల్సియస్ ",
+    "Dr.": "డాక్టర్ ", "Mr.": "మిస్టర్ ", "No.": "నంబర్ ", "e.g.": "ఉదాహరణకు ",
+    "i.e.": "అంటే ", "Fig.": "ఫిగర్ ", "Eq.": "సమీకరణం ", "Ch.": "అధ్యాయం ",
+    "*": "", "#": "", "_": "", "\n": ". ", "\t": " ",
+}
+LEGACY_ENGLISH = {
+    "e.g.": "for example", "i.e.": "that is", "Fig.": "Figure", "Eq.": "Equation", "Ch.": "Chapter",
+    "*": "", "#": "", "_": "", "\n": ". ", "\t": " ",
+}
+
+
+def legacy_telugu(text):
+    for k, v in LEGACY_TELUGU.items():
+        text = text.replace(k, v)
+    text = re.sub(r"(\d+)\.", r"\n\n\1.", text)
+    return re.sub(r" +", " ", text).strip()
+
+
+def legacy_english(text):
+    for k, v in LEGACY_ENGLISH.items():
+        text = text.replace(k, v)
+    return re.sub(r" +", " ", text).strip()
+
+
+SAMPLES = [
+    "## 1. **Definition**\nMean ante data lo unna anni values ni add chesi, total count tho divide cheyadam.\n"
+    "- **Formula**: Mean = Sum of values / Number of values (e.g. 10, 20, 30 అంటే 60/3 = 20)\n",
+    "Mean అంటే Average (e.g. 5+3=8). ఉదా. Dr. Rao explains x-y! in Fig. 2, i.e. 10% at 25°C.\n"
+    "- Key point: Σ over A ∩ B, A ∪ B, n÷2, 2^3 [see Eq. 4 / Ch. 3] {No. 7}\t_note_ •\n",
+    "",
+    "   plain text without rules   ",
+]
+# Pieces that never overlap once concatenated, so left-to-right and
+# rule-by-rule replacement must agree
+TOKENS = list(LEGACY_TELUGU) + ["word", "విలువ", " ", "  ", "12", "3.", ".", ",", "Mrs", "Fig", "ఉదా"]
+
+
+def random_texts(count=200, seed=7):
+    rng = random.Random(seed)
+    return ["".join(rng.choice(TOKENS) for _ in range(rng.randint(1, 40))) for _ in range(count)]
+
+
+@pytest.mark.parametrize("text", SAMPLES + random_texts())
+def test_tts_tables_match_the_legacy_chains(text):
+    assert normalize(text, "tts-te") == legacy_telugu(text)
+    assert normalize(text, "tts-en") == legacy_english(text)
+
+
+@pytest.mark.parametrize("text, english, telugu", [
+    # Overlapping abbreviations: the legacy chains replaced "e.g." first
+    # wherever it occurred; the normalizers take the leftmost match
+    ("i.e.g.", "that isg.", "అంటే g."),
+    ("See i.e.g. this", "See that isg. this", "See అంటే g. this"),
+    ("Mean, i.e.g. average", "Mean, that isg. average", "Mean, అంటే g. average"),
+])
+def test_overlapping_abbreviations_resolve_left_to_right(text, english, telugu):
+    assert normalize(text, "tts-en") == english
+    assert normalize(text, "tts-te") == telugu
+    assert legacy_english(text) != english
+
+
+def test_longest_literal_wins_and_output_is_not_rescanned():
+    normalizer = Normalizer({"a": "b", "ab": "X", "b": "a"})
+    assert normalizer("aab") == "bX"
+    assert normalizer("ba") == "ab"
+
+
+def test_patterns_and_literals_share_one_pass():
+    normalizer = Normalizer({"-": " minus "}, [(r"(\d+)%", r"\1 percent")], post=[(r" {2,}", " ")])
+    assert normalizer("5% - 3%") == "5 percent minus 3 percent"
+    assert Normalizer()("  untouched ") == "untouched"
+
+
+def test_chained_operations_are_all_spelled_out():
+    assert normalize("1+2x3", "voice-te") == "1 ప్లస్ 2 మల్టీప్లైడ్ 3"
@@ -0,0 +1,17 @@
+import pytest
+
+from smartconcept import config, resources
+
+
+def test_gemini_model_needs_an_api_key(monkeypatch):
+    monkeypatch.setattr(config, "GEMINI_API_KEY", None)
+    monkeypatch.setattr(resources, "_gemini_model", None)
+    with pytest.raises(RuntimeError, match="GEMINI_API_KEY"):
+        resources.get_gemini_model()
+
+
+def test_a_stand_in_model_needs_no_key(monkeypatch):
+    monkeypatch.setattr(config, "GEMINI_API_KEY", None)
+    model = object()
+    monkeypatch.setattr(resources, "_gemini_model", model)
+    assert resources.get_gemini_model() is model